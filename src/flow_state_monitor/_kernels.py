@@ -0,0 +1,244 @@
+"""
+Numeric kernels shared by the detection modules.
+
+The kernels are plain loops so that they can be compiled with Numba when it
+is installed (``pip install flow-state-monitor[speed]``). Without Numba they
+run as ordinary Python functions and behave identically; loops that would be
+slow in plain Python have a NumPy-vectorized equivalent that is used instead.
+Without Numba, rolling standard deviations use Bottleneck's C move_std when
+Bottleneck is installed.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when Numba is not installed."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+try:
+    import bottleneck
+    BOTTLENECK_AVAILABLE = True
+except ImportError:
+    BOTTLENECK_AVAILABLE = False
+
+
+# Running-moment rolling windows recompute their moments from scratch this
+# often, so rounding error from add/remove updates cannot build up
+REBASE_INTERVAL = 4096
+
+# ...and also whenever the window's sum of squared deviations falls below
+# this fraction of the squared update sizes since the last rebase, where the
+# accumulated rounding error would no longer be negligible (e.g. a flat
+# window right after a large move)
+REBASE_TOLERANCE = 1e-7
+
+
+if NUMBA_AVAILABLE:
+    def as_kernel_input(values):
+        """Convert a sequence to the contiguous float64 array Numba expects."""
+        return np.ascontiguousarray(values, dtype=np.float64)
+else:
+    def as_kernel_input(values):
+        """Pass sequences through unchanged for the pure-Python kernels."""
+        return values
+
+
+@njit(cache=True)
+def ema(values, alpha):
+    """Exponential moving average of values (most recent last)."""
+    result = values[0]
+    for i in range(1, len(values)):
+        result = alpha * values[i] + (1.0 - alpha) * result
+    return result
+
+
+@njit(cache=True)
+def ema_of_deltas(values, alpha):
+    """Exponential moving average of consecutive differences of values."""
+    result = values[1] - values[0]
+    for i in range(2, len(values)):
+        result = alpha * (values[i] - values[i - 1]) + (1.0 - alpha) * result
+    return result
+
+
+@njit(cache=True)
+def daily_returns_loop(prices):
+    """Daily percentage returns (p[t] - p[t-1]) / p[t-1] * 100."""
+    n = prices.shape[0] - 1
+    out = np.empty(n)
+    for i in range(n):
+        out[i] = (prices[i + 1] - prices[i]) / prices[i] * 100.0
+    return out
+
+
+def daily_returns_vectorized(prices):
+    """NumPy equivalent of daily_returns_loop (one output allocation)."""
+    out = np.subtract(prices[1:], prices[:-1])
+    out /= prices[:-1]
+    out *= 100.0
+    return out
+
+
+@njit(cache=True)
+def std_loop(values):
+    """Population standard deviation (ddof=0), two passes over values."""
+    n = values.shape[0]
+    mean = 0.0
+    for i in range(n):
+        mean += values[i]
+    mean /= n
+    var = 0.0
+    for i in range(n):
+        var += (values[i] - mean) ** 2
+    return np.sqrt(var / n)
+
+
+def std_vectorized(values):
+    """NumPy equivalent of std_loop."""
+    return np.std(values)
+
+
+@njit(cache=True)
+def rolling_std_loop(values, window):
+    """
+    Population standard deviation of every full window of values.
+
+    Element i covers values[i:i + window]; the result has
+    len(values) - window + 1 elements (empty when values is shorter).
+    Sliding one step is an O(1) Welford update of the window mean and sum of
+    squared deviations; both are recomputed exactly every REBASE_INTERVAL
+    windows, or sooner when they become small relative to the updates
+    applied since (see REBASE_TOLERANCE).
+    """
+    n = values.shape[0] - window + 1
+    if n < 0:
+        n = 0
+    out = np.empty(n)
+
+    mean = 0.0
+    m2 = 0.0
+    error_scale = 0.0
+    since_rebase = REBASE_INTERVAL
+    for i in range(n):
+        if since_rebase < REBASE_INTERVAL:
+            old = values[i - 1]
+            new = values[i + window - 1]
+            delta = new - old
+            new_mean = mean + delta / window
+            m2 += delta * (new - new_mean + old - mean)
+            mean = new_mean
+            error_scale += delta * delta
+            since_rebase += 1
+        if since_rebase >= REBASE_INTERVAL or m2 < REBASE_TOLERANCE * error_scale:
+            mean = 0.0
+            for k in range(i, i + window):
+                mean += values[k]
+            mean /= window
+            m2 = 0.0
+            for k in range(i, i + window):
+                m2 += (values[k] - mean) ** 2
+            error_scale = 0.0
+            since_rebase = 0
+        out[i] = np.sqrt(max(m2, 0.0) / window)
+    return out
+
+
+def rolling_std_vectorized(values, window):
+    """NumPy equivalent of rolling_std_loop."""
+    if values.shape[0] < window:
+        return np.empty(0)
+    return np.lib.stride_tricks.sliding_window_view(values, window).std(axis=1)
+
+
+def rolling_std_bottleneck(values, window):
+    """
+    Equivalent of rolling_std_loop using bottleneck.move_std.
+
+    move_std slides a running mean and sum of squared deviations like
+    rolling_std_loop but never rebases, so windows whose sum of squared
+    deviations is below REBASE_TOLERANCE times the squared update sizes so
+    far (e.g. a flat window right after a large move) are recomputed exactly.
+    """
+    if values.shape[0] < window:
+        return np.empty(0)
+    out = bottleneck.move_std(values, window)[window - 1:]
+
+    delta = values[window:] - values[:-window]
+    error_scale = np.zeros(out.shape[0])
+    error_scale[1:] = np.nancumsum(delta * delta)
+    suspect = np.flatnonzero(out * out * window < REBASE_TOLERANCE * error_scale)
+    if suspect.size:
+        windows = np.lib.stride_tricks.sliding_window_view(values, window)
+        out[suspect] = windows[suspect].std(axis=1)
+    return out
+
+
+_rolling_std_fallback = rolling_std_bottleneck if BOTTLENECK_AVAILABLE else rolling_std_vectorized
+
+
+@njit(cache=True)
+def price_signals_loop(returns, spike_threshold, lookback, multiplier):
+    """
+    Per-day spike and abnormal-volatility flags in a single pass over returns.
+
+    Outputs are aligned with the price series the returns came from: index i
+    holds the result for the day of prices[i], index 0 has no return.
+    Historical volatility for a day is the population standard deviation of
+    the `lookback` returns before it (NaN while fewer are available). Each
+    window is computed with std_loop rather than a sliding update, so the
+    results are bitwise identical to the per-day detectors, including ties
+    at the threshold; lookback is small, so the O(n * lookback) cost is low.
+    """
+    n = returns.shape[0] + 1
+    spike = np.zeros(n, dtype=np.bool_)
+    abnormal = np.zeros(n, dtype=np.bool_)
+    hist_vol = np.full(n, np.nan)
+
+    for j in range(returns.shape[0]):
+        r = returns[j]
+        spike[j + 1] = r >= spike_threshold
+        if j >= lookback:
+            hist_vol[j + 1] = std_loop(returns[j - lookback:j])
+            abnormal[j + 1] = abs(r) > hist_vol[j + 1] * multiplier
+
+    return spike, abnormal, hist_vol
+
+
+def price_signals_vectorized(returns, spike_threshold, lookback, multiplier):
+    """
+    NumPy equivalent of price_signals_loop for use without Numba.
+
+    Uses rolling_std_vectorized, whose per-window np.std matches the
+    per-day detectors bitwise; rolling_std_bottleneck does not.
+    """
+    n = returns.shape[0] + 1
+    spike = np.zeros(n, dtype=np.bool_)
+    abnormal = np.zeros(n, dtype=np.bool_)
+    hist_vol = np.full(n, np.nan)
+
+    spike[1:] = returns >= spike_threshold
+    if returns.shape[0] > lookback:
+        hist_vol[lookback + 1:] = rolling_std_vectorized(returns[:-1], lookback)
+        abnormal[lookback + 1:] = np.abs(returns[lookback:]) > hist_vol[lookback + 1:] * multiplier
+
+    return spike, abnormal, hist_vol
+
+
+if NUMBA_AVAILABLE:
+    daily_returns = daily_returns_loop
+    std = std_loop
+    rolling_std = rolling_std_loop
+    price_signals = price_signals_loop
+else:
+    daily_returns = daily_returns_vectorized
+    std = std_vectorized
+    rolling_std = _rolling_std_fallback
+    price_signals = price_signals_vectorized
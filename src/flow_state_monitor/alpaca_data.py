@@ -330,14 +330,18 @@ def fetch_combined_data(
     borrow_rates = borrow_data['borrow_rates']
     prices = price_data['prices']
 
-    min_len = min(len(borrow_rates), len(prices))
-    if len(borrow_rates) != len(prices):
+    # Align on the most recent days, trimming only the longer series
+    n_rates, n_prices = len(borrow_rates), len(prices)
+    if n_rates != n_prices:
+        min_len = min(n_rates, n_prices)
         logger.warning(
-            f"Data length mismatch: {len(borrow_rates)} borrow rates vs {len(prices)} prices. "
+            f"Data length mismatch: {n_rates} borrow rates vs {n_prices} prices. "
             f"Using most recent {min_len} data points."
         )
-        borrow_rates = borrow_rates[-min_len:]
-        prices = prices[-min_len:]
+        if n_rates > min_len:
+            borrow_rates = borrow_rates[-min_len:]
+        else:
+            prices = prices[-min_len:]
 
     return {
         'borrow_rates': borrow_rates,
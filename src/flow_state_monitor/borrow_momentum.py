@@ -9,6 +9,10 @@ Uses EMA (Exponential Moving Average) on daily deltas as specified in the design
 
 from typing import List, Tuple
 
+import numpy as np
+
+from ._kernels import as_kernel_input, ema, ema_of_deltas
+
 
 def calculate_ema(values: List[float], span: int) -> float:
     """
@@ -28,12 +32,7 @@ def calculate_ema(values: List[float], span: int) -> float:
         raise ValueError("Cannot calculate EMA of empty list")
 
     alpha = 2.0 / (span + 1)
-    ema = values[0]
-
-    for value in values[1:]:
-        ema = alpha * value + (1 - alpha) * ema
-
-    return ema
+    return float(ema(as_kernel_input(values), alpha))
 
 
 def calculate_momentum(borrow_rates: List[float], ema_span: int = 3) -> float:
@@ -57,20 +56,18 @@ def calculate_momentum(borrow_rates: List[float], ema_span: int = 3) -> float:
     if len(borrow_rates) < 2:
         raise ValueError("Need at least 2 borrow rates to calculate momentum")
 
-    for rate in borrow_rates:
-        if rate < 0:
-            raise ValueError("Borrow rates cannot be negative")
-
-    # Calculate daily deltas: ΔB(t) = borrow_rate(t) - borrow_rate(t-1)
-    deltas = [borrow_rates[i] - borrow_rates[i-1] for i in range(1, len(borrow_rates))]
-
-    # Apply EMA to deltas
-    if len(deltas) == 0:
-        return 0.0
+    rates = as_kernel_input(borrow_rates)
+    # fmin skips NaN, so a NaN cannot mask a negative rate (np.min would
+    # return NaN and let it through)
+    if np.fmin.reduce(rates) < 0:
+        raise ValueError("Borrow rates cannot be negative")
 
-    momentum = calculate_ema(deltas, span=ema_span)
+    # EMA of daily deltas ΔB(t) = borrow_rate(t) - borrow_rate(t-1),
+    # computed in one pass without materializing the delta list
+    alpha = 2.0 / (ema_span + 1)
+    momentum = ema_of_deltas(rates, alpha)
 
-    return momentum
+    return float(momentum)
 
 
 def detect_borrow_momentum(
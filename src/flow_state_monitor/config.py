@@ -6,12 +6,14 @@ flow state monitoring system. Configuration can be loaded from YAML files
 or provided programmatically.
 """
 
-import copy
 import os
 from typing import Any, Dict, Optional
 
 import yaml
 
+# libyaml's C parser when PyYAML was built with it, else the pure-Python one
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class Config:
     """
@@ -67,7 +69,11 @@ class Config:
         Args:
             config_path: Path to YAML configuration file. If None, uses defaults.
         """
-        self.config = copy.deepcopy(self.DEFAULT_CONFIG)
+        # Sections only hold scalars, so copying each section dict is enough
+        # to keep instances from sharing (and mutating) the defaults
+        self.config = {
+            section: dict(values) for section, values in self.DEFAULT_CONFIG.items()
+        }
 
         if config_path and os.path.exists(config_path):
             self.load_from_file(config_path)
@@ -84,7 +90,7 @@ class Config:
             yaml.YAMLError: If config file is invalid YAML
         """
         with open(path, 'r') as f:
-            user_config = yaml.safe_load(f)
+            user_config = yaml.load(f, Loader=_SafeLoader)
             if user_config:
                 self._merge_config(user_config)
 
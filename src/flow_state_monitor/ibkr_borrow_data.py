@@ -16,7 +16,13 @@ Example usage:
 import json
 import logging
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+try:
+    # Faster snapshot decoding when installed (flow-state-monitor[speed])
+    from orjson import loads as _loads
+except ImportError:
+    _loads = json.loads
 
 logger = logging.getLogger(__name__)
 
@@ -64,21 +70,38 @@ class IBKRBorrowDataFetcher:
         if not self.snapshot_dir.exists():
             raise ValueError(f"Snapshot directory not found: {snapshot_dir}")
 
+        # Parsed snapshots keyed by symbol, tagged with (mtime_ns, size) of the
+        # file they were read from so a rewritten snapshot is picked up
+        self._snapshot_cache: Dict[str, Tuple[Tuple[int, int], Dict]] = {}
+
     def _read_snapshot(self, symbol: str) -> Optional[Dict]:
-        """Read the latest snapshot for a symbol."""
+        """Read the latest snapshot for a symbol (re-parsed only when changed)."""
         snapshot_file = self.snapshot_dir / f"borrow-state-{symbol}-latest.json"
 
-        if not snapshot_file.exists():
+        try:
+            stat = snapshot_file.stat()
+        except FileNotFoundError:
             logger.warning(f"No snapshot found for {symbol}")
             return None
 
+        file_key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._snapshot_cache.get(symbol)
+        if cached is not None and cached[0] == file_key:
+            return cached[1]
+
         try:
-            with open(snapshot_file, 'r') as f:
-                return json.load(f)
+            snapshot = _loads(snapshot_file.read_bytes())
         except Exception as e:
             logger.error(f"Failed to read snapshot for {symbol}: {e}")
             return None
 
+        self._snapshot_cache[symbol] = (file_key, snapshot)
+        return snapshot
+
+    def clear_cache(self) -> None:
+        """Drop all cached snapshots so the next fetch re-reads from disk."""
+        self._snapshot_cache.clear()
+
     def _rate_to_percentage(self, rate_bucket: str) -> float:
         """Convert rate bucket to percentage."""
         return self.RATE_BUCKETS.get(rate_bucket, 0.0)
@@ -133,6 +156,39 @@ class IBKRBorrowDataFetcher:
             'timestamp': snapshot.get('timestamp')
         }
 
+    def fetch_multiple_symbols(
+        self,
+        symbols: List[str],
+        days: int = 30
+    ) -> Dict[str, Optional[Dict[str, List[float]]]]:
+        """
+        Fetch borrow rates for multiple symbols from their snapshots.
+
+        The snapshot directory is validated once for the whole batch.
+
+        Args:
+            symbols: List of ticker symbols
+            days: Number of days (used to repeat current rate for compatibility)
+
+        Returns:
+            Dictionary mapping symbol -> borrow data dict, or None if no
+            snapshot could be read for that symbol
+
+        Example:
+            >>> data = fetcher.fetch_multiple_symbols(['AAPL', 'GME', 'AMC'])
+            >>> gme_rates = data['GME']['borrow_rates']
+        """
+        results = {}
+
+        for symbol in symbols:
+            try:
+                results[symbol] = self.fetch_borrow_rates(symbol, days=days)
+            except ValueError as e:
+                logger.warning(f"Failed to fetch borrow data for {symbol}: {e}")
+                results[symbol] = None
+
+        return results
+
 
 def fetch_ibkr_borrow_rates(
     symbol: str,
@@ -172,3 +228,28 @@ def fetch_ibkr_borrow_rates(
     """
     fetcher = IBKRBorrowDataFetcher(snapshot_dir=snapshot_dir)
     return fetcher.fetch_borrow_rates(symbol, days=days)
+
+
+def fetch_ibkr_borrow_rates_many(
+    symbols: List[str],
+    days: int = 30,
+    snapshot_dir: str = './output',
+    **kwargs
+) -> Dict[str, Optional[Dict[str, List[float]]]]:
+    """
+    Convenience function to fetch borrow rates for many symbols at once.
+
+    Uses a single IBKRBorrowDataFetcher for the whole batch instead of one
+    per symbol.
+
+    Args:
+        symbols: List of ticker symbols
+        days: Number of days of data (rate repeated for compatibility)
+        snapshot_dir: Path to ibkr-borrow-sensor output directory
+        **kwargs: Additional arguments (for compatibility)
+
+    Returns:
+        Dictionary mapping symbol -> borrow data dict (None if unavailable)
+    """
+    fetcher = IBKRBorrowDataFetcher(snapshot_dir=snapshot_dir)
+    return fetcher.fetch_multiple_symbols(symbols, days=days)
@@ -10,8 +10,12 @@ Implements design specification (docs/design_specification.md):
 - Generates BUY/SELL/HOLD signals based on state transitions
 """
 
+from collections import deque
+from types import MappingProxyType
 from typing import Dict, List, Optional
 
+import numpy as np
+
 from .borrow_delta import detect_borrow_delta
 from .borrow_level import detect_borrow_level
 from .borrow_momentum import detect_borrow_momentum
@@ -20,6 +24,30 @@ from .market_state import detect_market_state
 from .price_behavior import detect_abnormal_volatility, detect_price_spike
 from .signals import SignalGenerator
 
+# Borrow levels that count as significant for flow state determination
+_HIGH_LEVELS = frozenset(("HIGH", "MEDIUM"))
+
+# Summary icons per trading signal
+_SIGNAL_ICONS = {"BUY": "🔵", "SELL": "🔴", "HOLD": "⚪"}
+
+# Shared read-only fallback for missing signal entries / details, so lookups
+# don't allocate a throwaway dict on every call
+_EMPTY = MappingProxyType({})
+
+
+def _as_price_array(prices) -> np.ndarray:
+    """
+    Convert prices to a float64 array for the price detectors.
+
+    No copy when prices already is a float64 array or a view of one.
+    Non-numeric sequences are converted value by value with float(), so a
+    value such as None or 'x' raises instead of silently becoming NaN.
+    """
+    array = np.asarray(prices)
+    if array.dtype.kind in "biuf":
+        return array.astype(np.float64, copy=False)
+    return np.array([float(p) for p in prices], dtype=np.float64)
+
 
 class FlowStateMonitor:
     """
@@ -65,6 +93,48 @@ class FlowStateMonitor:
         signal_config = self.config.get_section("signals")
         self.signal_generator = SignalGenerator(epsilon=signal_config["epsilon"])
 
+        # Rolling buffers for step(): only as much history as any detector reads
+        window = max(
+            self.config.get("general", "min_data_points"),
+            self.config.get("borrow_momentum", "lookback_period") + 1,
+            self.config.get("price_behavior", "volatility_lookback_period") + 2,
+            3,  # market_state looks at the last three borrow rates
+        )
+        self._borrow_window = deque(maxlen=window)
+        self._price_window = deque(maxlen=window)
+
+    def step(self, borrow_rate: float, price: float) -> Optional[Dict]:
+        """
+        Ingest one new daily observation and analyze the updated history.
+
+        Incremental alternative to calling analyze() on growing slices
+        (borrow_rates[:i+1], prices[:i+1]) in a day-by-day loop. Only the
+        most recent observations that the detectors read are retained, so
+        each call costs the same regardless of how long the run is, and the
+        result is identical to analyze() on the full history.
+
+        Args:
+            borrow_rate: Today's borrow rate in percent
+            price: Today's closing price
+
+        Returns:
+            Same dictionary as analyze(), or None while fewer than
+            min_data_points observations have been ingested
+        """
+        self._borrow_window.append(borrow_rate)
+        self._price_window.append(price)
+
+        if len(self._borrow_window) < self.config.get("general", "min_data_points"):
+            return None
+
+        return self.analyze(list(self._borrow_window), list(self._price_window))
+
+    def reset(self) -> None:
+        """Clear step() history and signal generator state."""
+        self._borrow_window.clear()
+        self._price_window.clear()
+        self.signal_generator.reset()
+
     def analyze(
         self,
         borrow_rates: List[float],
@@ -83,7 +153,8 @@ class FlowStateMonitor:
 
         Args:
             borrow_rates: List of daily borrow rates in percent (most recent last)
-            prices: List of daily closing prices (most recent last)
+            prices: List or float64 ndarray of daily closing prices
+                (most recent last)
 
         Returns:
             Dictionary containing:
@@ -98,7 +169,8 @@ class FlowStateMonitor:
             ValueError: If insufficient data provided
         """
         min_points = self.config.get("general", "min_data_points")
-        if len(borrow_rates) < min_points:
+        n_rates = len(borrow_rates)
+        if n_rates < min_points:
             raise ValueError(
                 f"Need at least {min_points} borrow rates for analysis"
             )
@@ -107,6 +179,11 @@ class FlowStateMonitor:
                 f"Need at least {min_points} prices for analysis"
             )
 
+        # Bind the most recent observations once; reused by several detectors
+        br_last = borrow_rates[-1]
+        br_prev = borrow_rates[-2] if n_rates > 1 else None
+        pr_last = prices[-1]
+
         signals = {}
 
         # Detect market state (per design specification)
@@ -132,7 +209,7 @@ class FlowStateMonitor:
         try:
             level_config = self.config.get_section("borrow_level")
             level, level_details = detect_borrow_level(
-                borrow_rates[-1],
+                br_last,
                 high_threshold=level_config["high_threshold_percent"],
                 medium_threshold=level_config["medium_threshold_percent"]
             )
@@ -150,8 +227,8 @@ class FlowStateMonitor:
         try:
             delta_config = self.config.get_section("borrow_delta")
             change_type, delta_details = detect_borrow_delta(
-                borrow_rates[-2],
-                borrow_rates[-1],
+                br_prev,
+                br_last,
                 increase_threshold=delta_config["increase_threshold_pct_points"],
                 decrease_threshold=delta_config["decrease_threshold_pct_points"]
             )
@@ -171,7 +248,7 @@ class FlowStateMonitor:
             lookback = momentum_config["lookback_period"]
             ema_span = momentum_config.get("ema_span", 3)
             # Use available data if less than lookback period
-            momentum_data = borrow_rates[-min(lookback+1, len(borrow_rates)):]
+            momentum_data = borrow_rates[-min(lookback+1, n_rates):]
 
             momentum_type, momentum_details = detect_borrow_momentum(
                 momentum_data,
@@ -191,40 +268,51 @@ class FlowStateMonitor:
             }
             borrow_momentum_value = 0.0
 
-        # Analyze price spike
+        # Convert prices to float64 once for both price detectors; a bad
+        # price value is reported under both price signals
         try:
-            price_config = self.config.get_section("price_behavior")
-            spike_detected, spike_details = detect_price_spike(
-                prices,
-                spike_threshold=price_config["spike_threshold_percent"]
-            )
-            signals["price_spike"] = {
-                "detected": spike_detected,
-                "details": spike_details
-            }
+            price_array = _as_price_array(prices)
         except Exception as e:
-            signals["price_spike"] = {
-                "detected": False,
-                "error": str(e)
-            }
-
-        # Analyze abnormal volatility
-        try:
-            price_config = self.config.get_section("price_behavior")
-            volatility_detected, volatility_details = detect_abnormal_volatility(
-                prices,
-                lookback_period=price_config["volatility_lookback_period"],
-                threshold_multiplier=price_config["volatility_threshold_multiplier"]
-            )
-            signals["abnormal_volatility"] = {
-                "detected": volatility_detected,
-                "details": volatility_details
-            }
-        except Exception as e:
-            signals["abnormal_volatility"] = {
-                "detected": False,
-                "error": str(e)
-            }
+            for name in ("price_spike", "abnormal_volatility"):
+                signals[name] = {
+                    "detected": False,
+                    "error": str(e)
+                }
+        else:
+            # Analyze price spike
+            try:
+                price_config = self.config.get_section("price_behavior")
+                spike_detected, spike_details = detect_price_spike(
+                    price_array,
+                    spike_threshold=price_config["spike_threshold_percent"]
+                )
+                signals["price_spike"] = {
+                    "detected": spike_detected,
+                    "details": spike_details
+                }
+            except Exception as e:
+                signals["price_spike"] = {
+                    "detected": False,
+                    "error": str(e)
+                }
+
+            # Analyze abnormal volatility
+            try:
+                price_config = self.config.get_section("price_behavior")
+                volatility_detected, volatility_details = detect_abnormal_volatility(
+                    price_array,
+                    lookback_period=price_config["volatility_lookback_period"],
+                    threshold_multiplier=price_config["volatility_threshold_multiplier"]
+                )
+                signals["abnormal_volatility"] = {
+                    "detected": volatility_detected,
+                    "details": volatility_details
+                }
+            except Exception as e:
+                signals["abnormal_volatility"] = {
+                    "detected": False,
+                    "error": str(e)
+                }
 
         # Determine overall flow state
         flow_state = self._determine_flow_state(signals)
@@ -235,8 +323,8 @@ class FlowStateMonitor:
                 market_state=market_state,
                 flow_state=flow_state,
                 borrow_momentum=borrow_momentum_value,
-                borrow_rate=borrow_rates[-1],
-                price=prices[-1]
+                borrow_rate=br_last,
+                price=pr_last
             )
         except Exception as e:
             signal = "HOLD"
@@ -269,13 +357,15 @@ class FlowStateMonitor:
         Returns:
             Flow state: "ON", "WEAKENING", or "OFF"
         """
-        borrow_level = signals.get("borrow_level", {}).get("level", "UNKNOWN")
-        change_type = signals.get("borrow_delta", {}).get("change_type", "UNKNOWN")
-        momentum_type = signals.get("borrow_momentum", {}).get("momentum_type", "UNKNOWN")
-        price_spike = signals.get("price_spike", {}).get("detected", False)
+        borrow_level = signals.get("borrow_level", _EMPTY).get("level", "UNKNOWN")
 
-        # Check if borrow level is significant
-        high_borrow = borrow_level in ["HIGH", "MEDIUM"]
+        # Without a significant borrow level there is no pressure to qualify
+        if borrow_level not in _HIGH_LEVELS:
+            return "OFF"
+
+        change_type = signals.get("borrow_delta", _EMPTY).get("change_type", "UNKNOWN")
+        momentum_type = signals.get("borrow_momentum", _EMPTY).get("momentum_type", "UNKNOWN")
+        price_spike = signals.get("price_spike", _EMPTY).get("detected", False)
 
         # Check for strengthening signals
         strengthening = (
@@ -290,16 +380,13 @@ class FlowStateMonitor:
             change_type == "DECREASING"
         )
 
-        # Determine state
-        if high_borrow and strengthening:
+        # Determine state (high borrow without a clear direction counts as ON)
+        if strengthening:
             return "ON"
-        elif high_borrow and weakening:
+        elif weakening:
             return "WEAKENING"
-        elif high_borrow:
-            # High borrow but no clear direction
-            return "ON"
         else:
-            return "OFF"
+            return "ON"
 
     def _generate_summary(
         self,
@@ -331,13 +418,13 @@ class FlowStateMonitor:
             Summary string
         """
         # Extract values from signals
-        borrow_rate = signals.get("borrow_level", {}).get("details", {}).get("borrow_rate", 0)
-        borrow_level = signals.get("borrow_level", {}).get("level", "UNKNOWN")
+        borrow_rate = signals.get("borrow_level", _EMPTY).get("details", _EMPTY).get("borrow_rate", 0)
+        borrow_level = signals.get("borrow_level", _EMPTY).get("level", "UNKNOWN")
 
-        delta_details = signals.get("borrow_delta", {}).get("details", {})
+        delta_details = signals.get("borrow_delta", _EMPTY).get("details", _EMPTY)
         delta = delta_details.get("delta", 0)
 
-        momentum_details = signals.get("borrow_momentum", {}).get("details", {})
+        momentum_details = signals.get("borrow_momentum", _EMPTY).get("details", _EMPTY)
         momentum = momentum_details.get("momentum", 0)
         ema_span = momentum_details.get("ema_span", 3)
 
@@ -373,7 +460,7 @@ class FlowStateMonitor:
         lines.append("")
 
         # Trading signal
-        signal_icon = {"BUY": "🔵", "SELL": "🔴", "HOLD": "⚪"}.get(signal, "⚪")
+        signal_icon = _SIGNAL_ICONS.get(signal, "⚪")
         lines.append(f"{signal_icon} SIGNAL: {signal}")
         lines.append(f"  Reason: {signal_reason}")
         lines.append("")
@@ -5,56 +5,220 @@ This module provides functionality to detect price behavior patterns that
 indicate forced buying pressure, such as price spikes and abnormal volatility.
 """
 
-from typing import List, Tuple
 import math
+from collections import deque
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 
-def calculate_daily_returns(prices: List[float]) -> List[float]:
+from ._kernels import REBASE_INTERVAL, REBASE_TOLERANCE, daily_returns, price_signals, std
+
+# Trading days per year, for annualizing daily volatility
+TRADING_DAYS_PER_YEAR = 252
+
+
+def _as_f64(values) -> np.ndarray:
+    """
+    Convert a sequence to a contiguous float64 array.
+
+    Zero-copy when values already is a contiguous float64 ndarray, so hot
+    loops can convert once and pass the array to several functions.
+    """
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+def _validated_prices(
+    prices,
+    min_n: int = 2,
+    purpose: str = "to calculate returns"
+) -> np.ndarray:
+    """
+    Check length and positivity of prices in one place.
+
+    Returns the prices as a float64 array (see _as_f64) so callers reuse
+    the converted buffer instead of converting again.
+    """
+    if len(prices) < min_n:
+        raise ValueError(f"Need at least {min_n} prices {purpose}")
+    
+    p = _as_f64(prices)
+    # A min reduction avoids the boolean mask of (p <= 0).any(); fmin skips
+    # NaN like the comparison did, so a NaN cannot mask a negative price
+    if np.fmin.reduce(p) <= 0:
+        raise ValueError("Prices must be positive")
+    return p
+
+
+def _recent_return(prices, purpose: str) -> float:
+    """Validate the last two prices and return the most recent daily return."""
+    if len(prices) < 2:
+        raise ValueError(f"Need at least 2 prices {purpose}")
+    
+    p_last = float(prices[-1])
+    p_prev = float(prices[-2])
+    if p_last <= 0 or p_prev <= 0:
+        raise ValueError("Prices must be positive")
+    
+    return (p_last - p_prev) / p_prev * 100.0
+
+
+def calculate_daily_returns(prices: List[float]) -> np.ndarray:
     """
     Calculate daily percentage returns from price data.
     
     Args:
-        prices: List of daily closing prices
+        prices: List (or float64 ndarray) of daily closing prices; a
+            contiguous float64 ndarray is used without copying
         
     Returns:
-        List of daily percentage returns
+        float64 ndarray of daily percentage returns, which can be passed
+        straight to calculate_volatility; call .tolist() for a plain list
         
     Raises:
         ValueError: If prices list is empty or contains invalid values
     """
-    if not prices or len(prices) < 2:
-        raise ValueError("Need at least 2 prices to calculate returns")
+    # (p[t] - p[t-1]) / p[t-1] * 100, kept in this form (not p[t] / p[t-1] - 1)
+    # so that exact-threshold moves stay exact
+    return daily_returns(_validated_prices(prices))  # Return as percentage
+
+
+def calculate_log_returns(prices: List[float]) -> np.ndarray:
+    """
+    Calculate daily log returns ln(p[t] / p[t-1]) from price data.
     
-    returns = []
-    for i in range(1, len(prices)):
-        if prices[i-1] <= 0 or prices[i] <= 0:
-            raise ValueError("Prices must be positive")
-        ret = (prices[i] - prices[i-1]) / prices[i-1] * 100.0  # Return as percentage
-        returns.append(ret)
+    Log returns are additive over time, so the return (and, for independent
+    days, the variance) over several days is a plain sum of daily values.
+    Expressed as percentages like calculate_daily_returns; pass them to
+    calculate_volatility (optionally annualized) for log-return volatility.
     
+    Args:
+        prices: List (or float64 ndarray) of daily closing prices; a
+            contiguous float64 ndarray is used without copying
+        
+    Returns:
+        float64 ndarray of daily log returns (as percentages); call
+        .tolist() for a plain list
+        
+    Raises:
+        ValueError: If prices list is empty or contains invalid values
+    """
+    p = _validated_prices(prices)
+    returns = np.divide(p[1:], p[:-1])
+    np.log(returns, out=returns)
+    returns *= 100.0
     return returns
 
 
-def calculate_volatility(returns: List[float]) -> float:
+def calculate_volatility(returns: List[float], annualize: bool = False) -> float:
     """
     Calculate standard deviation (volatility) of returns.
     
     Args:
-        returns: List of daily returns (as percentages)
+        returns: List (or float64 ndarray) of daily returns (as percentages);
+            a contiguous float64 ndarray is used without copying
+        annualize: Scale daily volatility by sqrt(TRADING_DAYS_PER_YEAR)
         
     Returns:
-        Standard deviation of returns
+        Standard deviation of returns (population, ddof=0)
         
     Raises:
         ValueError: If returns list is empty
     """
-    if not returns:
+    if len(returns) == 0:
         raise ValueError("Returns list cannot be empty")
     
-    n = len(returns)
-    mean = sum(returns) / n
-    variance = sum((r - mean) ** 2 for r in returns) / n
-    return math.sqrt(variance)
+    volatility = float(std(_as_f64(returns)))
+    if annualize:
+        volatility *= math.sqrt(TRADING_DAYS_PER_YEAR)
+    return volatility
+
+
+class RollingStd:
+    """
+    Rolling population standard deviation over a fixed window.
+
+    Keeps a running mean and sum of squared deviations (Welford's method) so
+    that each new observation is an O(1) update instead of a rescan of the
+    window. Both are recomputed from the window every REBASE_INTERVAL pushes,
+    or sooner when they become small relative to the updates applied since
+    (see REBASE_TOLERANCE), so rounding error cannot build up. Intended for
+    streaming callers that feed one daily return at a time; the result
+    matches calculate_volatility() over the same window.
+
+    Example:
+        >>> rolling = RollingStd(window=20)
+        >>> for r in returns:
+        ...     rolling.push(r)
+        >>> hist_vol = rolling.std()
+    """
+
+    def __init__(self, window: int):
+        """
+        Initialize rolling window.
+
+        Args:
+            window: Number of most recent values to include
+        """
+        if window < 1:
+            raise ValueError("Window must be at least 1")
+
+        self.window = window
+        self._values = deque(maxlen=window)
+        self._mean = 0.0
+        self._m2 = 0.0  # Sum of squared deviations from the mean
+        self._error_scale = 0.0  # Sum of squared update sizes since rebase
+        self._since_rebase = 0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @property
+    def is_full(self) -> bool:
+        """Whether the window holds `window` values."""
+        return len(self._values) == self.window
+
+    def push(self, value: float) -> None:
+        """Add a value, evicting the oldest one once the window is full."""
+        n = len(self._values)
+        if n == self.window:
+            old = self._values[0]
+            delta = value - old
+            new_mean = self._mean + delta / n
+            self._m2 += delta * (value - new_mean + old - self._mean)
+            self._mean = new_mean
+        else:
+            delta = value - self._mean
+            self._mean += delta / (n + 1)
+            self._m2 += delta * (value - self._mean)
+
+        self._values.append(value)
+
+        self._error_scale += delta * delta
+        self._since_rebase += 1
+        if (self._since_rebase >= REBASE_INTERVAL
+                or self._m2 < REBASE_TOLERANCE * self._error_scale):
+            self._rebase()
+
+    def _rebase(self) -> None:
+        """Recompute the running moments exactly from the current window."""
+        mean = math.fsum(self._values) / len(self._values)
+        self._mean = mean
+        self._m2 = math.fsum((v - mean) ** 2 for v in self._values)
+        self._error_scale = 0.0
+        self._since_rebase = 0
+
+    def std(self) -> float:
+        """
+        Standard deviation of the values currently in the window.
+
+        Raises:
+            ValueError: If no values have been pushed
+        """
+        n = len(self._values)
+        if n == 0:
+            raise ValueError("Returns list cannot be empty")
+
+        return math.sqrt(max(0.0, self._m2 / n))
 
 
 def detect_price_spike(
@@ -68,7 +232,7 @@ def detect_price_spike(
     covering their positions.
     
     Args:
-        prices: List of daily closing prices (most recent last)
+        prices: List or float64 ndarray of daily closing prices (most recent last)
         spike_threshold: Threshold for significant price increase (percentage)
         
     Returns:
@@ -79,13 +243,12 @@ def detect_price_spike(
             - spike_magnitude: How many times threshold was exceeded
             
     Raises:
-        ValueError: If insufficient data
+        ValueError: If insufficient data or either of the last two prices
+            is not positive
     """
-    if len(prices) < 2:
-        raise ValueError("Need at least 2 prices for spike detection")
-    
-    returns = calculate_daily_returns(prices)
-    recent_return = returns[-1]
+    # Only the most recent return matters, so use the last two prices
+    # directly rather than deriving returns for the whole series
+    recent_return = _recent_return(prices, "for spike detection")
     
     spike_detected = recent_return >= spike_threshold
     
@@ -98,10 +261,59 @@ def detect_price_spike(
     return spike_detected, details
 
 
+def detect_price_spike_batch(
+    prices,
+    spike_threshold: float = 5.0,
+    dtype=np.float64
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Detect price spikes for many symbols at once.
+    
+    Vectorized equivalent of calling detect_price_spike on every row of a
+    2-D price array, for callers monitoring a universe of symbols each tick.
+    
+    Args:
+        prices: 2-D array-like of shape (n_symbols, n_days) of daily closing
+            prices (most recent last in each row)
+        spike_threshold: Threshold for significant price increase (percentage)
+        dtype: Floating dtype the returns are computed in. The float64
+            default matches detect_price_spike exactly; np.float32 halves
+            memory traffic for large universes already stored as float32,
+            but returns within ~1e-5 of the threshold may be classified
+            differently
+        
+    Returns:
+        Tuple of (spike_detected, recent_return), both arrays of length
+        n_symbols: a bool array and the most recent return (percentage) of
+        each symbol, in dtype
+            
+    Raises:
+        ValueError: If prices is not 2-D, has fewer than 2 days, or either of
+            the last two prices of any symbol is not positive
+    """
+    p = np.asarray(prices)
+    if p.ndim != 2:
+        raise ValueError("Prices must be a 2-D array of shape (n_symbols, n_days)")
+    if p.shape[1] < 2:
+        raise ValueError("Need at least 2 prices for spike detection")
+    
+    p_last = p[:, -1].astype(dtype)
+    p_prev = p[:, -2].astype(dtype)
+    if np.fmin.reduce(np.fmin(p_last, p_prev), initial=np.inf) <= 0:
+        raise ValueError("Prices must be positive")
+    
+    recent_return = p_last - p_prev
+    recent_return /= p_prev
+    recent_return *= 100.0
+    
+    return recent_return >= spike_threshold, recent_return
+
+
 def detect_abnormal_volatility(
     prices: List[float],
     lookback_period: int = 20,
-    threshold_multiplier: float = 2.0
+    threshold_multiplier: float = 2.0,
+    historical_volatility: Optional[float] = None
 ) -> Tuple[bool, dict]:
     """
     Detect abnormally high volatility.
@@ -109,10 +321,24 @@ def detect_abnormal_volatility(
     Abnormal volatility can indicate forced buying pressure and uncertainty
     as shorts cover positions.
     
+    Streaming callers can keep the baseline in a RollingStd of daily returns
+    and pass it as historical_volatility; only the last two prices are then
+    read, so each call is O(1) instead of a pass over the lookback window.
+    
+    Example:
+        >>> rolling = RollingStd(window=20)
+        >>> # each day, once rolling.is_full:
+        >>> abnormal, _ = detect_abnormal_volatility(
+        ...     prices, historical_volatility=rolling.std())
+        >>> _, spike = detect_price_spike(prices)
+        >>> rolling.push(spike["recent_return"])  # after the check
+    
     Args:
-        prices: List of daily closing prices (most recent last)
+        prices: List or float64 ndarray of daily closing prices (most recent last)
         lookback_period: Days to use for historical volatility baseline
         threshold_multiplier: Multiplier for historical volatility
+        historical_volatility: Precomputed volatility of the lookback_period
+            returns before the most recent one; computed from prices when None
         
     Returns:
         Tuple of (abnormal_detected: bool, details: dict)
@@ -125,20 +351,20 @@ def detect_abnormal_volatility(
     Raises:
         ValueError: If insufficient data
     """
-    if len(prices) < lookback_period + 2:
-        raise ValueError(
-            f"Need at least {lookback_period + 2} prices for volatility analysis"
-        )
-    
-    returns = calculate_daily_returns(prices)
-    
-    # Get historical returns (last lookback_period returns, excluding most recent)
-    # With lookback_period returns needed for history, we slice to get exactly those
-    historical_returns = returns[-(lookback_period + 1):-1]
-    recent_return = returns[-1]
-    
-    # Calculate historical volatility
-    hist_vol = calculate_volatility(historical_returns)
+    if historical_volatility is not None:
+        recent_return = _recent_return(prices, "for volatility analysis")
+        hist_vol = float(historical_volatility)
+    else:
+        p = _validated_prices(prices, lookback_period + 2, "for volatility analysis")
+        returns = daily_returns(p)
+        
+        # Get historical returns (last lookback_period returns, excluding most recent)
+        # With lookback_period returns needed for history, we slice to get exactly those
+        historical_returns = returns[-(lookback_period + 1):-1]
+        recent_return = float(returns[-1])
+        
+        # Calculate historical volatility
+        hist_vol = calculate_volatility(historical_returns)
     threshold = hist_vol * threshold_multiplier
     
     # Check for abnormal volatility
@@ -152,3 +378,48 @@ def detect_abnormal_volatility(
     }
     
     return abnormal_detected, details
+
+
+def detect_price_behavior_series(
+    prices: List[float],
+    spike_threshold: float = 5.0,
+    lookback_period: int = 20,
+    threshold_multiplier: float = 2.0
+) -> Dict[str, np.ndarray]:
+    """
+    Run spike and abnormal volatility detection for every day of a series.
+
+    Equivalent to calling detect_price_spike and detect_abnormal_volatility on
+    prices[:i+1] for each day i, but computed in one pass (JIT-compiled when
+    Numba is installed) instead of re-deriving returns for every prefix.
+    Intended for backtests over long histories.
+
+    Args:
+        prices: List or float64 ndarray of daily closing prices (most recent last)
+        spike_threshold: Threshold for significant price increase (percentage)
+        lookback_period: Days to use for historical volatility baseline
+        threshold_multiplier: Multiplier for historical volatility
+
+    Returns:
+        Dictionary of arrays aligned with prices (index 0 has no return):
+            - recent_return: Daily return (percentage), NaN at index 0
+            - spike: Whether a price spike was detected that day
+            - abnormal_volatility: Whether volatility was abnormal that day
+              (False while fewer than lookback_period + 2 prices are available)
+            - historical_volatility: Volatility baseline used that day (NaN
+              while unavailable)
+
+    Raises:
+        ValueError: If fewer than 2 prices or any non-positive price
+    """
+    returns = calculate_daily_returns(prices)
+    spike, abnormal, hist_vol = price_signals(
+        returns, float(spike_threshold), int(lookback_period), float(threshold_multiplier)
+    )
+
+    return {
+        "recent_return": np.concatenate(([np.nan], returns)),
+        "spike": spike,
+        "abnormal_volatility": abnormal,
+        "historical_volatility": hist_vol,
+    }
@@ -9,17 +9,46 @@ Per design specification (docs/design_specification.md):
 This module tracks state transitions to detect proper entry/exit timing.
 """
 
-from typing import Dict, List, Tuple
+from typing import Optional, Tuple
+
+
+def _days_since_flip(
+    days: Optional[int],
+    previous_state: Optional[str],
+    state: str
+) -> Optional[int]:
+    """
+    Advance a days-since-OFF→ON-flip counter by one update.
+
+    Returns 0 on the day of a flip, counts up while the state stays ON, and
+    None when the state is not ON or the ON run did not start with a flip.
+    """
+    if previous_state == "OFF" and state == "ON":
+        return 0
+    if state == "ON" and days is not None:
+        return days + 1
+    return None
 
 
 class SignalGenerator:
     """
     Generates BUY/SELL/HOLD signals based on state transitions.
 
-    Tracks historical states to detect transitions and generate signals
-    according to the design specification rules.
+    Instead of keeping a history of past states, tracks the few facts the
+    design specification rules need, each updated in O(1):
+    - days since market_state / flow_state last flipped OFF → ON
+    - number of consecutive updates with momentum below -epsilon
     """
 
+    __slots__ = (
+        "epsilon",
+        "prev_market",
+        "prev_flow",
+        "days_since_market_on",
+        "days_since_flow_on",
+        "exit_streak",
+    )
+
     def __init__(self, epsilon: float = 0.05):
         """
         Initialize signal generator.
@@ -28,7 +57,7 @@ class SignalGenerator:
             epsilon: Deadband for momentum exit signal (default: 0.05 pct pts/day)
         """
         self.epsilon = epsilon
-        self.history: List[Dict] = []
+        self.reset()
 
     def update(
         self,
@@ -52,114 +81,98 @@ class SignalGenerator:
             Tuple of (signal: str, reason: str)
             Signal is "BUY", "SELL", or "HOLD"
         """
-        current = {
-            "market_state": market_state,
-            "flow_state": flow_state,
-            "borrow_momentum": borrow_momentum,
-            "borrow_rate": borrow_rate,
-            "price": price,
-        }
+        first_update = self.prev_market is None
 
-        self.history.append(current)
+        self.days_since_market_on = _days_since_flip(
+            self.days_since_market_on, self.prev_market, market_state
+        )
+        self.days_since_flow_on = _days_since_flip(
+            self.days_since_flow_on, self.prev_flow, flow_state
+        )
+        self.prev_market = market_state
+        self.prev_flow = flow_state
 
-        # Generate signal based on current state and history
-        signal, reason = self._generate_signal()
+        if borrow_momentum < -self.epsilon:
+            self.exit_streak += 1
+        else:
+            self.exit_streak = 0
+
+        if first_update:
+            return "HOLD", "Insufficient history for signal generation"
 
-        return signal, reason
+        # Generate signal based on current state and tracked transitions
+        return self._generate_signal(market_state, flow_state, borrow_momentum, borrow_rate)
 
-    def _generate_signal(self) -> Tuple[str, str]:
+    def _generate_signal(
+        self,
+        market_state: str,
+        flow_state: str,
+        borrow_momentum: float,
+        borrow_rate: float
+    ) -> Tuple[str, str]:
         """
-        Generate signal based on current state and transition history.
+        Generate signal based on current state and tracked transitions.
 
         Returns:
             Tuple of (signal: str, reason: str)
         """
-        if len(self.history) < 2:
-            return "HOLD", "Insufficient history for signal generation"
-
-        current = self.history[-1]
-        previous = self.history[-2]
-
         # Check for ENTRY (BUY) signal
         # Conditions:
         # 1. market_state flips OFF → ON
         # 2. flow_state flips OFF → ON
         # 3. Both flips occur same day or within 1 day
+        dsm = self.days_since_market_on
+        dsf = self.days_since_flow_on
 
-        market_flip = (previous["market_state"] == "OFF" and
-                      current["market_state"] == "ON")
-
-        flow_flip = (previous["flow_state"] == "OFF" and
-                    current["flow_state"] == "ON")
-
-        # Check if both flipped today
-        if market_flip and flow_flip:
+        if dsm == 0 and dsf == 0:
             return "BUY", (
                 f"ENTRY: Both market_state and flow_state transitioned to ON "
-                f"(borrow rate: {current['borrow_rate']:.1f}%)"
-            )
-
-        # Check if they flipped within 1 day
-        if len(self.history) >= 3:
-            prev_prev = self.history[-3]
-
-            # Market flipped yesterday, flow flips today
-            market_flip_yesterday = (
-                prev_prev["market_state"] == "OFF" and
-                previous["market_state"] == "ON" and
-                current["market_state"] == "ON"
+                f"(borrow rate: {borrow_rate:.1f}%)"
             )
 
-            # Flow flipped yesterday, market flips today
-            flow_flip_yesterday = (
-                prev_prev["flow_state"] == "OFF" and
-                previous["flow_state"] == "ON" and
-                current["flow_state"] == "ON"
+        if (dsm == 1 and dsf == 0) or (dsf == 1 and dsm == 0):
+            return "BUY", (
+                f"ENTRY: market_state and flow_state both ON within 1 day "
+                f"(borrow rate: {borrow_rate:.1f}%)"
             )
 
-            if (market_flip_yesterday and flow_flip) or (flow_flip_yesterday and market_flip):
-                return "BUY", (
-                    f"ENTRY: market_state and flow_state both ON within 1 day "
-                    f"(borrow rate: {current['borrow_rate']:.1f}%)"
-                )
-
         # Check for EXIT (SELL) signal
         # Condition: EMA(ΔB) < -epsilon
         # Must hold for 1 full trading day (current + previous)
-
-        current_exit_condition = current["borrow_momentum"] < -self.epsilon
-        previous_exit_condition = previous["borrow_momentum"] < -self.epsilon
-
-        if current_exit_condition and previous_exit_condition:
+        if self.exit_streak >= 2:
             return "SELL", (
-                f"EXIT: Borrow momentum {current['borrow_momentum']:.3f} < "
+                f"EXIT: Borrow momentum {borrow_momentum:.3f} < "
                 f"-epsilon ({-self.epsilon:.3f}) for 1+ day - constraint exhaustion detected"
             )
 
         # Check if we should HOLD in position or HOLD out of position
         in_position = (
-            current["market_state"] == "ON" or
-            current["flow_state"] in ["ON", "WEAKENING"]
+            market_state == "ON" or
+            flow_state in ("ON", "WEAKENING")
         )
 
         if in_position:
-            if current["borrow_momentum"] < -self.epsilon:
+            if self.exit_streak == 1:
                 # Exit condition met today but not confirmed yet
                 return "HOLD", (
                     f"HOLD: Exit condition triggered but awaiting 1-day confirmation "
-                    f"(momentum: {current['borrow_momentum']:.3f})"
+                    f"(momentum: {borrow_momentum:.3f})"
                 )
             else:
                 return "HOLD", (
                     f"HOLD: Position active, no exit signal "
-                    f"(momentum: {current['borrow_momentum']:.3f}, epsilon: {self.epsilon:.3f})"
+                    f"(momentum: {borrow_momentum:.3f}, epsilon: {self.epsilon:.3f})"
                 )
         else:
             return "HOLD", (
                 f"HOLD: No entry conditions met "
-                f"(market={current['market_state']}, flow={current['flow_state']})"
+                f"(market={market_state}, flow={flow_state})"
             )
 
     def reset(self):
-        """Reset history."""
-        self.history = []
+        """Reset tracked state."""
+        self.prev_market: Optional[str] = None
+        self.prev_flow: Optional[str] = None
+        self.days_since_market_on: Optional[int] = None
+        self.days_since_flow_on: Optional[int] = None
+        self.exit_streak = 0
@@ -23,19 +23,18 @@ prices = [
 
 monitor = FlowStateMonitor()
 
-# Analyze day by day
-for i in range(5, len(borrow_rates)):
-    print(f"\nDay {i+1}:")
-    print("-" * 70)
+# Feed the data day by day (step() returns None until enough history)
+for day, (borrow_rate, price) in enumerate(zip(borrow_rates, prices), start=1):
+    result = monitor.step(borrow_rate, price)
+    if result is None:
+        continue
 
-    result = monitor.analyze(
-        borrow_rates=borrow_rates[:i+1],
-        prices=prices[:i+1]
-    )
+    print(f"\nDay {day}:")
+    print("-" * 70)
 
     print(f"Market State: {result['market_state']}")
     print(f"Flow State: {result['flow_state']}")
-    print(f"Borrow Rate: {borrow_rates[i]:.1f}%")
+    print(f"Borrow Rate: {borrow_rate:.1f}%")
     print(f"Signal: {result['signal']}")
 
     if result['signal'] in ['BUY', 'SELL']:
@@ -28,14 +28,13 @@ prices_entry = [
 monitor = FlowStateMonitor()
 
 # Analyze each day to show transition
-for i in range(5, len(borrow_rates_entry)):
-    print(f"\nDay {i+1}:")
-    print("-" * 70)
+for day, (borrow_rate, price) in enumerate(zip(borrow_rates_entry, prices_entry), start=1):
+    result = monitor.step(borrow_rate, price)
+    if result is None:
+        continue
 
-    result = monitor.analyze(
-        borrow_rates=borrow_rates_entry[:i+1],
-        prices=prices_entry[:i+1]
-    )
+    print(f"\nDay {day}:")
+    print("-" * 70)
 
     print(f"Market State: {result['market_state']}")
     print(f"Flow State: {result['flow_state']}")
@@ -66,28 +65,20 @@ prices_exit = [
 # Create fresh monitor to reset state tracking
 monitor2 = FlowStateMonitor()
 
-# Warm up the signal generator with the rising phase
-for i in range(5, 8):
-    monitor2.analyze(
-        borrow_rates=borrow_rates_exit[:i+1],
-        prices=prices_exit[:i+1]
-    )
-
-# Now show the exit phase
+# Warm up with the rising phase (days 1-7), then show the exit phase
 print("\nDays 8-11 (Exit Phase):")
-for i in range(7, len(borrow_rates_exit)):
-    print(f"\nDay {i+1}:")
-    print("-" * 70)
+for day, (borrow_rate, price) in enumerate(zip(borrow_rates_exit, prices_exit), start=1):
+    result = monitor2.step(borrow_rate, price)
+    if day < 8:
+        continue
 
-    result = monitor2.analyze(
-        borrow_rates=borrow_rates_exit[:i+1],
-        prices=prices_exit[:i+1]
-    )
+    print(f"\nDay {day}:")
+    print("-" * 70)
 
     print(f"Market State: {result['market_state']}")
     print(f"Flow State: {result['flow_state']}")
     print(f"Signal: {result['signal']}")
-    print(f"Borrow Rate: {borrow_rates_exit[i]:.1f}%")
+    print(f"Borrow Rate: {borrow_rate:.1f}%")
     print(f"Momentum: {result['signals']['borrow_momentum']['details']['momentum']:.3f}")
 
     if result['signal'] in ['BUY', 'SELL']:
@@ -1,6 +1,258 @@
+import contextlib
+import http.client
 import json
-import urllib.error
-import urllib.request
+import socket
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urljoin, urlsplit
+
+try:
+    import pytest
+    # Talks to the internet; opt in with `pytest -m network`
+    pytestmark = pytest.mark.network
+except ImportError:  # run as a plain script
+    pass
+
+CACHE_FILE = '.ortex_probe_cache.json'
+CACHE_TTL = 3600  # seconds
+TIMEOUT = 10  # seconds
+RETRY_ATTEMPTS = 3
+RETRY_WAIT = 0.3  # seconds
+MAX_REDIRECTS = 5
+
+
+def _load_cache():
+    """Load cached endpoint responses, or an empty cache if none exists."""
+    try:
+        with open(CACHE_FILE, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(cache):
+    """Write cached endpoint responses back to disk."""
+    with open(CACHE_FILE, 'w') as f:
+        json.dump(cache, f)
+
+
+def _fetch(conn, path, headers):
+    """
+    HEAD-check then GET an endpoint, retrying dropped connections.
+
+    Returns (status, reason, body, location); body is None when the HEAD
+    check failed or redirected, and location is the Location header of a
+    redirect (else None).
+    """
+    for attempt in range(RETRY_ATTEMPTS):
+        try:
+            # Cheap HEAD first so failing endpoints never send a body;
+            # 405 means the server does not support HEAD, so try GET
+            conn.request('HEAD', path, headers=headers)
+            response = conn.getresponse()
+            response.read()
+
+            if 300 <= response.status < 400:
+                return response.status, response.reason, None, response.getheader('Location')
+            if response.status >= 400 and response.status != 405:
+                return response.status, response.reason, None, None
+
+            conn.request('GET', path, headers=headers)
+            response = conn.getresponse()
+            body = response.read()
+            location = response.getheader('Location') if 300 <= response.status < 400 else None
+            return response.status, response.reason, body, location
+
+        except (ConnectionResetError, http.client.RemoteDisconnected):
+            # Server dropped the keep-alive connection; it reopens on next
+            # use. Timeouts are not retried: each would cost another TIMEOUT
+            conn.close()
+            if attempt == RETRY_ATTEMPTS - 1:
+                raise
+            time.sleep(RETRY_WAIT)
+        except OSError:
+            conn.close()
+            raise
+
+
+def _fetch_following(conn, url, headers, lines):
+    """
+    _fetch an endpoint, following up to MAX_REDIRECTS redirects.
+
+    Redirects on the same host reuse conn; a redirect to another host opens
+    a connection for it that is closed before returning. Each followed hop
+    is appended to lines. Returns (status, reason, body) of the last response.
+    """
+    parts = urlsplit(url)
+    with contextlib.ExitStack() as stack:
+        connections = {(parts.scheme, parts.netloc): conn}
+        for hop in range(MAX_REDIRECTS + 1):
+            parts = urlsplit(url)
+            key = (parts.scheme, parts.netloc)
+            if key not in connections:
+                if parts.scheme == 'https':
+                    connections[key] = http.client.HTTPSConnection(parts.netloc, timeout=TIMEOUT)
+                else:
+                    connections[key] = http.client.HTTPConnection(parts.netloc, timeout=TIMEOUT)
+                stack.callback(connections[key].close)
+
+            target = parts.path or '/'
+            if parts.query:
+                target += '?' + parts.query
+            status, reason, body, location = _fetch(connections[key], target, headers)
+            if location is None or hop == MAX_REDIRECTS:
+                return status, reason, body
+
+            url = urljoin(url, location)
+            lines.append(f"  → Redirect {status} to {url}")
+
+
+def _probe_endpoint(conn, url, headers, entry):
+    """
+    Probe a single endpoint, or replay its cached response.
+
+    Returns (lines, entry, timed_out): the report lines for the endpoint,
+    the cache entry for the response when it answered with valid JSON (else
+    None), and whether the request timed out.
+    """
+    lines = [f"Trying: {url}"]
+
+    if entry is not None:
+        lines.append("  ✓ Cached response")
+        status = entry['status']
+        body = entry['body'].encode('utf-8')
+    else:
+        try:
+            status, reason, body = _fetch_following(conn, url, headers, lines)
+        except (socket.timeout, TimeoutError) as e:
+            lines += [f"  ✗ Timed out: {e}", ""]
+            return lines, None, True
+        except OSError as e:
+            lines += [f"  ✗ URL Error: {e}", ""]
+            return lines, None, False
+        except Exception as e:
+            conn.close()
+            lines += [f"  ✗ Unexpected error: {type(e).__name__}: {str(e)}", ""]
+            return lines, None, False
+
+        if 300 <= status < 400:
+            # No Location header, or more than MAX_REDIRECTS hops
+            lines += [f"  ✗ Redirect {status} not followed: {reason}", ""]
+            return lines, None, False
+        if status >= 400:
+            lines.append(f"  ✗ HTTP Error {status}: {reason}")
+            if body:
+                error_body = body[:200].decode('utf-8', errors='replace')
+                lines.append(f"  Error response: {error_body}")
+            lines.append("")
+            return lines, None, False
+
+    lines.append(f"  ✓ Success! Status: {status}")
+    lines.append(f"  Response length: {len(body)} bytes")
+
+    # Sniff the first bytes so an HTML page is rejected without decoding it
+    head = body[:64].lstrip()
+    if head.startswith((b'<!DOCTYPE', b'<html')):
+        lines += ["  ✗ Got HTML response (wrong endpoint)", ""]
+        return lines, None, False
+    if not head.startswith((b'{', b'[')):
+        lines += ["  ✗ Couldn't parse as JSON", ""]
+        return lines, None, False
+
+    # Try to parse as JSON
+    try:
+        json_data = json.loads(body)
+        lines.append("  ✓ Valid JSON response!")
+        lines.append(f"  Keys: {list(json_data.keys())}")
+        lines.append(f"  Sample data: {str(json_data)[:200]}")
+    except Exception:
+        lines += ["  ✗ Couldn't parse as JSON", ""]
+        return lines, None, False
+
+    if entry is None:
+        entry = {'time': time.time(), 'status': status, 'body': body.decode('utf-8')}
+    return lines, entry, False
+
+
+def _probe_host(conn, urls, headers, cached):
+    """
+    Probe a host's endpoints in order over its keep-alive connection.
+
+    Stops at the first endpoint that answers with valid JSON. Once the host
+    times out, its remaining endpoints are reported as skipped rather than
+    each waiting out another TIMEOUT. Returns a list of (url, lines, entry)
+    tuples as produced by _probe_endpoint.
+    """
+    results = []
+    for i, url in enumerate(urls):
+        lines, entry, timed_out = _probe_endpoint(conn, url, headers, cached.get(url))
+        results.append((url, lines, entry))
+        if entry is not None:
+            break
+        if timed_out:
+            for skipped in urls[i + 1:]:
+                lines = [f"Trying: {skipped}", "  ✗ Skipped: host timed out", ""]
+                results.append((skipped, lines, None))
+            break
+    return results
+
+
+def _run_probe(api_key, endpoints, headers, out):
+    """Probe the endpoints, appending report lines to out; True on success."""
+    # Successful responses are cached on disk for CACHE_TTL seconds
+    cache = _load_cache()
+    now = time.time()
+    cached = {}
+    for url in endpoints:
+        entry = cache.get(f'{api_key} {url}')
+        if entry is not None and now - entry['time'] < CACHE_TTL:
+            cached[url] = entry
+
+    # Hosts are probed in parallel, one worker and one keep-alive connection
+    # per host, so endpoints on the same host share a TCP+TLS handshake
+    hosts = {}
+    for url in endpoints:
+        hosts.setdefault(urlsplit(url).netloc, []).append(url)
+
+    outcomes = {}
+    with contextlib.ExitStack() as stack:
+        # Connections are registered first so they are closed only after
+        # the executor has shut down and no worker can still be using them
+        connections = {}
+        for host in hosts:
+            conn = http.client.HTTPSConnection(host, timeout=TIMEOUT)
+            stack.callback(conn.close)
+            connections[host] = conn
+
+        executor = stack.enter_context(ThreadPoolExecutor(max_workers=len(hosts)))
+        futures = [
+            executor.submit(_probe_host, connections[host], urls, headers, cached)
+            for host, urls in hosts.items()
+        ]
+        for future in as_completed(futures):
+            for url, lines, entry in future.result():
+                outcomes[url] = (lines, entry)
+
+    # Report in endpoint order; endpoints a host skipped after an earlier
+    # success are never reached because that success is reported first
+    for url in endpoints:
+        lines, entry = outcomes[url]
+        out.extend(lines)
+        if entry is not None:
+            out += ["", "=" * 60, "SUCCESS! This endpoint works:", url, "=" * 60]
+            if entry is not cached.get(url):
+                cache[f'{api_key} {url}'] = entry
+                _save_cache(cache)
+            return True
+
+    out += [
+        "=" * 60,
+        "No working endpoint found with TEST key",
+        "You may need a real API key from https://public.ortex.com/",
+        "=" * 60,
+    ]
+    return False
 
 
 def test_ortex_api():
@@ -22,65 +274,13 @@ def test_ortex_api():
         'Accept': 'application/json'
     }
 
-    print("Testing Ortex API with TEST key")
-    print(f"Symbol: {symbol}")
-    print()
-
-    for url in endpoints:
-        print(f"Trying: {url}")
-
-        try:
-            request = urllib.request.Request(url, headers=headers)
-
-            with urllib.request.urlopen(request, timeout=10) as response:
-                status = response.status
-                data = response.read().decode('utf-8')
-
-                print(f"  ✓ Success! Status: {status}")
-                print(f"  Response length: {len(data)} chars")
-
-                # Check if it's HTML or JSON
-                if data.strip().startswith('<!DOCTYPE') or data.strip().startswith('<html'):
-                    print("  ✗ Got HTML response (wrong endpoint)")
-                else:
-                    # Try to parse as JSON
-                    try:
-                        json_data = json.loads(data)
-                        print("  ✓ Valid JSON response!")
-                        print(f"  Keys: {list(json_data.keys())}")
-                        print(f"  Sample data: {str(json_data)[:200]}")
-                        print()
-                        print("=" * 60)
-                        print("SUCCESS! This endpoint works:")
-                        print(url)
-                        print("=" * 60)
-                        return True
-                    except:
-                        print("  ✗ Couldn't parse as JSON")
-                print()
-
-        except urllib.error.HTTPError as e:
-            print(f"  ✗ HTTP Error {e.code}: {e.reason}")
-            try:
-                error_body = e.read().decode('utf-8')[:200]
-                print(f"  Error response: {error_body}")
-            except:
-                pass
-            print()
-
-        except urllib.error.URLError as e:
-            print(f"  ✗ URL Error: {e.reason}")
-            print()
-
-        except Exception as e:
-            print(f"  ✗ Unexpected error: {type(e).__name__}: {str(e)}")
-            print()
-
-    print("=" * 60)
-    print("No working endpoint found with TEST key")
-    print("You may need a real API key from https://public.ortex.com/")
-    print("=" * 60)
-    return False
+    # Report lines are buffered and written to stdout once at the end
+    out = ["Testing Ortex API with TEST key", f"Symbol: {symbol}", ""]
+    try:
+        return _run_probe(api_key, endpoints, headers, out)
+    finally:
+        sys.stdout.write("\n".join(out) + "\n")
+        sys.stdout.flush()
 
 if __name__ == '__main__':
     test_ortex_api()
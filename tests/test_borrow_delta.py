@@ -4,55 +4,24 @@ import pytest
 from flow_state_monitor.borrow_delta import detect_borrow_delta
 
 
-def test_increasing_delta():
-    """Test detection of increasing borrow rate."""
-    change_type, details = detect_borrow_delta(5.0, 8.0)
-    
-    assert change_type == "INCREASING"
-    assert details["change_type"] == "INCREASING"
-    assert details["delta"] == 3.0
-
-
-def test_decreasing_delta():
-    """Test detection of decreasing borrow rate."""
-    change_type, details = detect_borrow_delta(10.0, 7.0)
-    
-    assert change_type == "DECREASING"
-    assert details["change_type"] == "DECREASING"
-    assert details["delta"] == -3.0
-
-
-def test_stable_delta():
-    """Test detection of stable borrow rate."""
-    change_type, details = detect_borrow_delta(10.0, 10.5)
-    
-    assert change_type == "STABLE"
-    assert details["change_type"] == "STABLE"
-
-
-def test_delta_at_increase_threshold():
-    """Test delta exactly at increase threshold."""
-    change_type, details = detect_borrow_delta(5.0, 7.0, increase_threshold=2.0)
-    
-    assert change_type == "INCREASING"
-
-
-def test_delta_at_decrease_threshold():
-    """Test delta exactly at decrease threshold."""
-    change_type, details = detect_borrow_delta(10.0, 8.0, decrease_threshold=-2.0)
-    
-    assert change_type == "DECREASING"
-
-
-def test_custom_thresholds():
-    """Test with custom threshold values."""
-    change_type, details = detect_borrow_delta(
-        10.0, 12.5, 
-        increase_threshold=3.0, 
-        decrease_threshold=-3.0
-    )
-    
-    assert change_type == "STABLE"
+@pytest.mark.parametrize("previous,current,thresholds,expected", [
+    (5.0, 8.0, {}, "INCREASING"),
+    (10.0, 7.0, {}, "DECREASING"),
+    (10.0, 10.5, {}, "STABLE"),
+    # Exactly at the thresholds
+    (5.0, 7.0, {"increase_threshold": 2.0}, "INCREASING"),
+    (10.0, 8.0, {"decrease_threshold": -2.0}, "DECREASING"),
+    # Custom thresholds
+    (10.0, 12.5, {"increase_threshold": 3.0, "decrease_threshold": -3.0}, "STABLE"),
+], ids=["increasing", "decreasing", "stable", "at-increase-threshold",
+        "at-decrease-threshold", "custom-thresholds"])
+def test_delta_classification(previous, current, thresholds, expected):
+    """Test classification of borrow rate changes."""
+    change_type, details = detect_borrow_delta(previous, current, **thresholds)
+
+    assert change_type == expected
+    assert details["change_type"] == expected
+    assert details["delta"] == current - previous
 
 
 def test_negative_borrow_rates():
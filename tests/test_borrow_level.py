@@ -4,52 +4,24 @@ import pytest
 from flow_state_monitor.borrow_level import detect_borrow_level
 
 
-def test_high_borrow_level():
-    """Test detection of high borrow rate level."""
-    level, details = detect_borrow_level(15.0)
-    
-    assert level == "HIGH"
-    assert details["level"] == "HIGH"
-    assert details["borrow_rate"] == 15.0
-
-
-def test_medium_borrow_level():
-    """Test detection of medium borrow rate level."""
-    level, details = detect_borrow_level(7.5)
-    
-    assert level == "MEDIUM"
-    assert details["level"] == "MEDIUM"
-    assert details["borrow_rate"] == 7.5
-
-
-def test_low_borrow_level():
-    """Test detection of low borrow rate level."""
-    level, details = detect_borrow_level(2.0)
-    
-    assert level == "LOW"
-    assert details["level"] == "LOW"
-    assert details["borrow_rate"] == 2.0
-
-
-def test_borrow_level_at_high_threshold():
-    """Test borrow rate exactly at high threshold."""
-    level, details = detect_borrow_level(10.0, high_threshold=10.0)
-    
-    assert level == "HIGH"
-
-
-def test_borrow_level_at_medium_threshold():
-    """Test borrow rate exactly at medium threshold."""
-    level, details = detect_borrow_level(5.0, medium_threshold=5.0)
-    
-    assert level == "MEDIUM"
-
-
-def test_custom_thresholds():
-    """Test with custom threshold values."""
-    level, details = detect_borrow_level(12.0, high_threshold=15.0, medium_threshold=8.0)
-    
-    assert level == "MEDIUM"
+@pytest.mark.parametrize("borrow_rate,thresholds,expected", [
+    (15.0, {}, "HIGH"),
+    (7.5, {}, "MEDIUM"),
+    (2.0, {}, "LOW"),
+    # Exactly at the thresholds
+    (10.0, {"high_threshold": 10.0}, "HIGH"),
+    (5.0, {"medium_threshold": 5.0}, "MEDIUM"),
+    # Custom thresholds
+    (12.0, {"high_threshold": 15.0, "medium_threshold": 8.0}, "MEDIUM"),
+], ids=["high", "medium", "low", "at-high-threshold", "at-medium-threshold",
+        "custom-thresholds"])
+def test_borrow_level_classification(borrow_rate, thresholds, expected):
+    """Test classification of borrow rate levels."""
+    level, details = detect_borrow_level(borrow_rate, **thresholds)
+
+    assert level == expected
+    assert details["level"] == expected
+    assert details["borrow_rate"] == borrow_rate
 
 
 def test_negative_borrow_rate():
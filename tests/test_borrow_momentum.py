@@ -1,90 +1,71 @@
 """Tests for borrow momentum detection module."""
 
+import numpy as np
 import pytest
 from flow_state_monitor.borrow_momentum import calculate_momentum, detect_borrow_momentum
 
 
-def test_calculate_momentum_increasing():
-    """Test momentum calculation with increasing rates."""
-    rates = [5.0, 7.0, 9.0, 11.0, 13.0]
-    momentum = calculate_momentum(rates)
-    
-    assert momentum == 2.0  # (13-5)/4 = 2.0
+def reference_momentum(rates, ema_span=3):
+    """Closed-form EMA of daily deltas: each delta weighted by its decay."""
+    deltas = np.diff(np.asarray(rates, dtype=np.float64))
+    alpha = 2.0 / (ema_span + 1)
+    weights = alpha * (1.0 - alpha) ** np.arange(len(deltas) - 1, -1, -1)
+    # The first delta seeds the EMA, so it carries the remaining weight
+    weights[0] = (1.0 - alpha) ** (len(deltas) - 1)
+    return float(np.dot(weights, deltas))
 
 
-def test_calculate_momentum_decreasing():
-    """Test momentum calculation with decreasing rates."""
-    rates = [20.0, 17.0, 14.0, 11.0, 8.0]
-    momentum = calculate_momentum(rates)
-    
-    assert momentum == -3.0  # (8-20)/4 = -3.0
-
-
-def test_calculate_momentum_stable():
-    """Test momentum calculation with stable rates."""
-    rates = [10.0, 10.5, 10.2, 10.3, 10.0]
-    momentum = calculate_momentum(rates)
-    
+@pytest.mark.parametrize("rates,expected", [
+    ([5.0, 7.0, 9.0, 11.0, 13.0], 2.0),  # (13-5)/4 = 2.0
+    ([20.0, 17.0, 14.0, 11.0, 8.0], -3.0),  # (8-20)/4 = -3.0
     # Momentum uses EMA(ΔB) with default span=3.
     # For this sequence, EMA(deltas) converges to -0.1.
-    assert momentum == pytest.approx(-0.1)
-
-
-def test_positive_momentum():
-    """Test detection of positive momentum."""
-    rates = [5.0, 7.5, 10.0, 12.5, 15.0, 17.5]
-    momentum_type, details = detect_borrow_momentum(rates)
-    
-    assert momentum_type == "POSITIVE"
-    assert details["momentum_type"] == "POSITIVE"
-    assert details["momentum"] == 2.5
-
-
-def test_negative_momentum():
-    """Test detection of negative momentum."""
-    rates = [20.0, 17.0, 14.0, 11.0, 8.0, 5.0]
-    momentum_type, details = detect_borrow_momentum(rates)
-    
-    assert momentum_type == "NEGATIVE"
-    assert details["momentum_type"] == "NEGATIVE"
-    assert details["momentum"] == -3.0
-
-
-def test_neutral_momentum():
-    """Test detection of neutral momentum."""
-    rates = [10.0, 10.2, 10.4, 10.3, 10.5]
-    momentum_type, details = detect_borrow_momentum(rates)
-    
-    assert momentum_type == "NEUTRAL"
-
-
-def test_momentum_at_positive_threshold():
-    """Test momentum exactly at positive threshold."""
-    rates = [5.0, 6.0, 7.0, 8.0, 9.0]
-    momentum_type, details = detect_borrow_momentum(rates, positive_threshold=1.0)
-    
-    assert momentum_type == "POSITIVE"
-
-
-def test_momentum_at_negative_threshold():
-    """Test momentum exactly at negative threshold."""
-    rates = [10.0, 9.0, 8.0, 7.0, 6.0]
-    momentum_type, details = detect_borrow_momentum(rates, negative_threshold=-1.0)
-    
-    assert momentum_type == "NEGATIVE"
-
-
-def test_custom_thresholds():
-    """Test with custom threshold values."""
-    rates = [10.0, 11.5, 13.0, 14.5, 16.0]
-    momentum_type, details = detect_borrow_momentum(
-        rates,
-        positive_threshold=2.0,
-        negative_threshold=-2.0
-    )
-    
+    ([10.0, 10.5, 10.2, 10.3, 10.0], pytest.approx(-0.1)),
+    ([5.0, 7.5, 10.0, 12.5, 15.0, 17.5], 2.5),
+    ([20.0, 17.0, 14.0, 11.0, 8.0, 5.0], -3.0),
+], ids=["increasing", "decreasing", "stable", "positive", "negative"])
+def test_calculate_momentum(rates, expected):
+    """Test momentum calculation (EMA of daily deltas)."""
+    assert calculate_momentum(rates) == expected
+
+
+@pytest.mark.parametrize("rates,thresholds,expected", [
+    ([5.0, 7.5, 10.0, 12.5, 15.0, 17.5], {}, "POSITIVE"),
+    ([20.0, 17.0, 14.0, 11.0, 8.0, 5.0], {}, "NEGATIVE"),
+    ([10.0, 10.2, 10.4, 10.3, 10.5], {}, "NEUTRAL"),
+    # Exactly at the thresholds
+    ([5.0, 6.0, 7.0, 8.0, 9.0], {"positive_threshold": 1.0}, "POSITIVE"),
+    ([10.0, 9.0, 8.0, 7.0, 6.0], {"negative_threshold": -1.0}, "NEGATIVE"),
     # Momentum is 1.5, which is below positive threshold of 2.0
-    assert momentum_type == "NEUTRAL"
+    ([10.0, 11.5, 13.0, 14.5, 16.0],
+     {"positive_threshold": 2.0, "negative_threshold": -2.0}, "NEUTRAL"),
+], ids=["positive", "negative", "neutral", "at-positive-threshold",
+        "at-negative-threshold", "custom-thresholds"])
+def test_momentum_classification(rates, thresholds, expected):
+    """Test classification of borrow rate momentum."""
+    momentum_type, details = detect_borrow_momentum(rates, **thresholds)
+
+    assert momentum_type == expected
+    assert details["momentum_type"] == expected
+    assert details["momentum"] == calculate_momentum(rates)
+
+
+def test_calculate_momentum_long_linear_series():
+    """Test that a long evenly spaced series has momentum equal to its step."""
+    rates = np.linspace(1.0, 100.0, 10000).tolist()
+
+    assert calculate_momentum(rates) == pytest.approx(99.0 / 9999)
+
+
+@pytest.mark.parametrize("ema_span", [3, 5])
+def test_calculate_momentum_matches_reference(ema_span):
+    """Test momentum against a NumPy reference on a long random series."""
+    rng = np.random.default_rng(0)
+    rates = np.abs(10.0 + np.cumsum(rng.normal(0.0, 0.5, 10000))).tolist()
+
+    assert calculate_momentum(rates, ema_span=ema_span) == pytest.approx(
+        reference_momentum(rates, ema_span)
+    )
 
 
 def test_insufficient_data():
@@ -99,6 +80,12 @@ def test_negative_rates():
         calculate_momentum([5.0, 7.0, -1.0, 9.0])
 
 
+def test_negative_rates_after_nan():
+    """Test that a NaN does not hide a negative rate."""
+    with pytest.raises(ValueError, match="cannot be negative"):
+        calculate_momentum([1.0, np.nan, -1.0])
+
+
 def test_invalid_positive_threshold():
     """Test that invalid positive threshold raises ValueError."""
     with pytest.raises(ValueError, match="must be positive"):
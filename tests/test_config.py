@@ -1,8 +1,6 @@
 """Tests for configuration module."""
 
 import pytest
-import tempfile
-import os
 from flow_state_monitor.config import Config
 
 
@@ -15,58 +13,51 @@ def test_default_config():
     assert config.get("general", "min_data_points") == 6
 
 
-def test_get_section():
+def test_get_section(default_config):
     """Test getting entire configuration section."""
-    config = Config()
-    
-    borrow_level = config.get_section("borrow_level")
+    borrow_level = default_config.get_section("borrow_level")
     assert "high_threshold_percent" in borrow_level
     assert "medium_threshold_percent" in borrow_level
 
 
-def test_load_custom_config():
-    """Test loading custom configuration from file."""
-    # Create temporary config file
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-        f.write("""
+FULL_CUSTOM_YAML = """
 borrow_level:
   high_threshold_percent: 15.0
   medium_threshold_percent: 8.0
 
 general:
   min_data_points: 10
-""")
-        config_path = f.name
-    
-    try:
-        config = Config(config_path)
-        
-        assert config.get("borrow_level", "high_threshold_percent") == 15.0
-        assert config.get("borrow_level", "medium_threshold_percent") == 8.0
-        assert config.get("general", "min_data_points") == 10
-    finally:
-        os.unlink(config_path)
-
-
-def test_partial_custom_config():
-    """Test that custom config merges with defaults."""
-    # Create temporary config file with only partial settings
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-        f.write("""
+"""
+
+# Only partial settings; everything else must fall back to the defaults
+PARTIAL_CUSTOM_YAML = """
 borrow_level:
   high_threshold_percent: 20.0
-""")
-        config_path = f.name
-    
-    try:
-        config = Config(config_path)
-        
+"""
+
+
+@pytest.mark.parametrize("yaml_text,expected", [
+    (FULL_CUSTOM_YAML, {
+        ("borrow_level", "high_threshold_percent"): 15.0,
+        ("borrow_level", "medium_threshold_percent"): 8.0,
+        ("general", "min_data_points"): 10,
+    }),
+    (PARTIAL_CUSTOM_YAML, {
         # Custom value
-        assert config.get("borrow_level", "high_threshold_percent") == 20.0
+        ("borrow_level", "high_threshold_percent"): 20.0,
         # Default value (not overridden)
-        assert config.get("borrow_level", "medium_threshold_percent") == 5.0
-    finally:
-        os.unlink(config_path)
+        ("borrow_level", "medium_threshold_percent"): 5.0,
+    }),
+], ids=["full", "partial"])
+def test_custom_config(tmp_path, yaml_text, expected):
+    """Test loading custom configuration from file and merging with defaults."""
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml_text)
+
+    config = Config(str(config_path))
+
+    for (section, key), value in expected.items():
+        assert config.get(section, key) == value
 
 
 def test_nonexistent_config_file():
@@ -77,17 +68,24 @@ def test_nonexistent_config_file():
     assert config.get("borrow_level", "high_threshold_percent") == 10.0
 
 
-def test_get_nonexistent_key():
+def test_custom_config_does_not_modify_defaults(tmp_path):
+    """Test that loading a custom config leaves the class defaults untouched."""
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("borrow_level:\n  high_threshold_percent: 30.0\n")
+
+    Config(str(config_path))
+
+    assert Config.DEFAULT_CONFIG["borrow_level"]["high_threshold_percent"] == 10.0
+    assert Config().get("borrow_level", "high_threshold_percent") == 10.0
+
+
+def test_get_nonexistent_key(default_config):
     """Test that getting nonexistent key raises KeyError."""
-    config = Config()
-    
     with pytest.raises(KeyError):
-        config.get("nonexistent", "key")
+        default_config.get("nonexistent", "key")
 
 
-def test_get_section_nonexistent():
+def test_get_section_nonexistent(default_config):
     """Test that getting nonexistent section returns empty dict."""
-    config = Config()
-    
-    section = config.get_section("nonexistent")
+    section = default_config.get_section("nonexistent")
     assert section == {}
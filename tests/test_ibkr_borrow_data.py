@@ -6,6 +6,7 @@ These tests are offline-only and validate:
 - error handling when snapshot dir / file missing
 """
 
+import os
 from pathlib import Path
 
 import pytest
@@ -13,16 +14,38 @@ import pytest
 from flow_state_monitor.ibkr_borrow_data import (
     IBKRBorrowDataFetcher,
     fetch_ibkr_borrow_rates,
+    fetch_ibkr_borrow_rates_many,
 )
 
+EXPECTED_BUCKETS = {
+    "VERY_LOW": 0.5,
+    "LOW": 2.0,
+    "MEDIUM": 5.0,
+    "HIGH": 10.0,
+    "VERY_HIGH": 25.0,
+    "EXTREME": 50.0,
+    "UNKNOWN": 0.0,
+}
+
+AAPL_SNAPSHOT = b'{"rate":"HIGH","availability":"AVAILABLE","changeDirection":"UP","timestamp":"2026-01-01T00:00:00Z"}'
+TSLA_SNAPSHOT = b'{"rate":"LOW","availability":"AVAILABLE","changeDirection":"DOWN","timestamp":"2026-01-01T00:00:00Z"}'
+GME_SNAPSHOT = b'{"rate":"VERY_HIGH","availability":"HARD_TO_BORROW","changeDirection":"UP","timestamp":"2026-01-01T00:00:00Z"}'
+
+
+@pytest.fixture(scope="module")
+def snap_dir(tmp_path_factory) -> Path:
+    """Snapshot directory shared by this module; tests use distinct symbols."""
+    return tmp_path_factory.mktemp("snapshots")
+
+
+@pytest.fixture(scope="module")
+def fetcher(snap_dir: Path) -> IBKRBorrowDataFetcher:
+    """Fetcher over the shared snapshot directory, constructed once."""
+    return IBKRBorrowDataFetcher(snapshot_dir=str(snap_dir))
+
 
 def test_rate_bucket_mapping():
-    assert IBKRBorrowDataFetcher.RATE_BUCKETS["VERY_LOW"] == 0.5
-    assert IBKRBorrowDataFetcher.RATE_BUCKETS["LOW"] == 2.0
-    assert IBKRBorrowDataFetcher.RATE_BUCKETS["MEDIUM"] == 5.0
-    assert IBKRBorrowDataFetcher.RATE_BUCKETS["HIGH"] == 10.0
-    assert IBKRBorrowDataFetcher.RATE_BUCKETS["VERY_HIGH"] == 25.0
-    assert IBKRBorrowDataFetcher.RATE_BUCKETS["EXTREME"] == 50.0
+    assert IBKRBorrowDataFetcher.RATE_BUCKETS == EXPECTED_BUCKETS
 
 
 def test_init_raises_for_missing_snapshot_dir(tmp_path: Path):
@@ -31,28 +54,45 @@ def test_init_raises_for_missing_snapshot_dir(tmp_path: Path):
         IBKRBorrowDataFetcher(snapshot_dir=str(missing))
 
 
-def test_snapshot_filename_convention(tmp_path: Path):
-    (tmp_path / "borrow-state-AAPL-latest.json").write_text(
-        '{"rate":"HIGH","availability":"AVAILABLE","changeDirection":"UP","timestamp":"2026-01-01T00:00:00Z"}'
-    )
+def test_snapshot_filename_convention(snap_dir: Path, fetcher: IBKRBorrowDataFetcher):
+    (snap_dir / "borrow-state-AAPL-latest.json").write_bytes(AAPL_SNAPSHOT)
 
-    fetcher = IBKRBorrowDataFetcher(snapshot_dir=str(tmp_path))
     data = fetcher.fetch_borrow_rates("AAPL", days=3)
 
     assert data["rate_bucket"] == "HIGH"
     assert data["borrow_rates"] == [10.0, 10.0, 10.0]
 
 
-def test_fetch_ibkr_borrow_rates_convenience(tmp_path: Path):
-    (tmp_path / "borrow-state-TSLA-latest.json").write_text(
-        '{"rate":"LOW","availability":"AVAILABLE","changeDirection":"DOWN","timestamp":"2026-01-01T00:00:00Z"}'
-    )
+def test_fetch_ibkr_borrow_rates_convenience(snap_dir: Path):
+    (snap_dir / "borrow-state-TSLA-latest.json").write_bytes(TSLA_SNAPSHOT)
 
-    data = fetch_ibkr_borrow_rates("TSLA", days=2, snapshot_dir=str(tmp_path))
+    data = fetch_ibkr_borrow_rates("TSLA", days=2, snapshot_dir=str(snap_dir))
     assert data["borrow_rates"] == [2.0, 2.0]
 
 
-def test_raises_when_symbol_snapshot_missing(tmp_path: Path):
-    fetcher = IBKRBorrowDataFetcher(snapshot_dir=str(tmp_path))
+def test_raises_when_symbol_snapshot_missing(fetcher: IBKRBorrowDataFetcher):
     with pytest.raises(ValueError, match="No borrow data available"):
         fetcher.fetch_borrow_rates("MSFT", days=5)
+
+
+def test_fetch_ibkr_borrow_rates_many(snap_dir: Path):
+    (snap_dir / "borrow-state-GME-latest.json").write_bytes(GME_SNAPSHOT)
+
+    data = fetch_ibkr_borrow_rates_many(["GME", "MSFT"], days=2, snapshot_dir=str(snap_dir))
+
+    assert data["GME"]["borrow_rates"] == [25.0, 25.0]
+    assert data["MSFT"] is None
+
+
+def test_snapshot_reread_after_update(snap_dir: Path, fetcher: IBKRBorrowDataFetcher):
+    snapshot = snap_dir / "borrow-state-AMC-latest.json"
+    snapshot.write_bytes(b'{"rate":"LOW"}')
+
+    assert fetcher.fetch_borrow_rates("AMC", days=1)["borrow_rates"] == [2.0]
+    assert fetcher.fetch_borrow_rates("AMC", days=1)["borrow_rates"] == [2.0]
+
+    snapshot.write_bytes(b'{"rate":"EXTREME"}')
+    stat = snapshot.stat()
+    os.utime(snapshot, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert fetcher.fetch_borrow_rates("AMC", days=1)["borrow_rates"] == [50.0]
@@ -6,17 +6,20 @@ module structure and error handling. Integration testing with a real
 IBKR connection should be done manually.
 """
 
+import importlib.util
+
 import pytest
 
 from flow_state_monitor.ibkr_data import IBKRDataFetcher
 
+# Metadata-only lookup; avoids importing ib_insync and its dependencies
+HAVE_IB_INSYNC = importlib.util.find_spec("ib_insync") is not None
+
 
 def test_ibkr_fetcher_initialization():
     """Test that IBKRDataFetcher can be initialized with default parameters."""
     fetcher = IBKRDataFetcher()
-    assert fetcher.host == '127.0.0.1'
-    assert fetcher.port == 7497
-    assert fetcher.client_id == 1
+    assert (fetcher.host, fetcher.port, fetcher.client_id) == ('127.0.0.1', 7497, 1)
     assert fetcher.ib is None
     assert not fetcher.is_connected()
 
@@ -24,9 +27,7 @@ def test_ibkr_fetcher_initialization():
 def test_ibkr_fetcher_custom_initialization():
     """Test that IBKRDataFetcher can be initialized with custom parameters."""
     fetcher = IBKRDataFetcher(host='192.168.1.100', port=4001, client_id=5)
-    assert fetcher.host == '192.168.1.100'
-    assert fetcher.port == 4001
-    assert fetcher.client_id == 5
+    assert (fetcher.host, fetcher.port, fetcher.client_id) == ('192.168.1.100', 4001, 5)
 
 
 def test_not_connected_error():
@@ -44,10 +45,11 @@ def test_disconnect_when_not_connected():
 
 
 def test_context_manager_interface():
-    """Test that IBKRDataFetcher has context manager methods."""
+    """Test that IBKRDataFetcher has context manager and fetch methods."""
     fetcher = IBKRDataFetcher()
-    assert hasattr(fetcher, '__enter__')
-    assert hasattr(fetcher, '__exit__')
+    required = {'__enter__', '__exit__', 'connect', 'disconnect', 'fetch_daily_bars'}
+    missing = required - set(dir(fetcher))
+    assert not missing, f"missing: {missing}"
 
 
 def test_fetch_ibkr_data_function_exists():
@@ -56,20 +58,19 @@ def test_fetch_ibkr_data_function_exists():
     assert callable(fetch_ibkr_data)
 
 
+@pytest.mark.skipif(HAVE_IB_INSYNC, reason="ib_insync is installed")
 def test_missing_ib_insync_error():
     """Test that proper error is raised when ib_insync is not available."""
-    # This test will pass if ib_insync is not installed
-    # If ib_insync IS installed, it will test that connect works
     fetcher = IBKRDataFetcher()
-    try:
-        import ib_insync
-        # If ib_insync is installed, we can't test the ImportError
-        # but we can verify the connect method exists
-        assert hasattr(fetcher, 'connect')
-    except ImportError:
-        # ib_insync not installed - test the error handling
-        with pytest.raises(ImportError, match="ib_insync"):
-            fetcher.connect()
+    with pytest.raises(ImportError, match="ib_insync"):
+        fetcher.connect()
+
+
+@pytest.mark.skipif(not HAVE_IB_INSYNC, reason="ib_insync is not installed")
+def test_connect_available_with_ib_insync():
+    """Test that connect is available when ib_insync is installed."""
+    fetcher = IBKRDataFetcher()
+    assert hasattr(fetcher, 'connect')
 
 
 # Note: The following tests would require a live IBKR connection
@@ -1,8 +1,13 @@
 """Tests for main monitor module."""
 
+import re
+
 import pytest
 from flow_state_monitor import FlowStateMonitor, Config
 
+# Anchored on the label so the MARKET STATE line (also ON/OFF) cannot match
+_FLOW_STATE_RE = re.compile(r"\bFLOW STATE:\s*(ON|OFF|WEAKENING)\b", re.IGNORECASE)
+
 
 def test_monitor_initialization():
     """Test monitor initializes correctly."""
@@ -11,9 +16,8 @@ def test_monitor_initialization():
     assert monitor.config is not None
 
 
-def test_analyze_flow_state_on(sample_borrow_rates_increasing, sample_prices_spiking):
+def test_analyze_flow_state_on(monitor, sample_borrow_rates_increasing, sample_prices_spiking):
     """Test detection of ON flow state."""
-    monitor = FlowStateMonitor()
     results = monitor.analyze(sample_borrow_rates_increasing, sample_prices_spiking)
     
     assert results['flow_state'] == 'ON'
@@ -23,28 +27,25 @@ def test_analyze_flow_state_on(sample_borrow_rates_increasing, sample_prices_spi
     assert 'price_spike' in results['signals']
 
 
-def test_analyze_flow_state_weakening(sample_borrow_rates_decreasing, sample_prices_declining):
+def test_analyze_flow_state_weakening(monitor, sample_borrow_rates_decreasing, sample_prices_declining):
     """Test detection of WEAKENING flow state."""
-    monitor = FlowStateMonitor()
     results = monitor.analyze(sample_borrow_rates_decreasing, sample_prices_declining)
     
     assert results['flow_state'] == 'WEAKENING'
 
 
-def test_analyze_flow_state_off(sample_borrow_rates_stable, sample_prices_stable):
+def test_analyze_flow_state_off(monitor, sample_borrow_rates_stable, sample_prices_stable):
     """Test detection of OFF flow state."""
-    monitor = FlowStateMonitor()
     results = monitor.analyze(sample_borrow_rates_stable, sample_prices_stable)
     
     assert results['flow_state'] == 'OFF'
 
 
-def test_analyze_returns_all_fields():
+def test_analyze_returns_all_fields(monitor):
     """Test that analyze returns all required fields."""
     borrow_rates = [5.0, 7.0, 9.0, 11.0, 13.0, 15.0, 17.0, 19.0]
     prices = [100.0, 102.0, 105.0, 108.0, 112.0, 117.0, 123.0, 130.0]
     
-    monitor = FlowStateMonitor()
     results = monitor.analyze(borrow_rates, prices)
     
     assert 'flow_state' in results
@@ -55,28 +56,37 @@ def test_analyze_returns_all_fields():
     assert isinstance(results['summary'], str)
 
 
-def test_analyze_insufficient_borrow_rates():
+def test_analyze_insufficient_borrow_rates(monitor):
     """Test that insufficient borrow rate data raises ValueError."""
     borrow_rates = [5.0, 7.0]  # Only 2 points
     prices = [100.0, 102.0, 104.0, 106.0, 108.0, 110.0]
     
-    monitor = FlowStateMonitor()
-    
     with pytest.raises(ValueError, match="at least"):
         monitor.analyze(borrow_rates, prices)
 
 
-def test_analyze_insufficient_prices():
+def test_analyze_insufficient_prices(monitor):
     """Test that insufficient price data raises ValueError."""
     borrow_rates = [5.0, 7.0, 9.0, 11.0, 13.0, 15.0]
     prices = [100.0, 102.0]  # Only 2 points
     
-    monitor = FlowStateMonitor()
-    
     with pytest.raises(ValueError, match="at least"):
         monitor.analyze(borrow_rates, prices)
 
 
+@pytest.mark.parametrize("bad_price", ["x", None])
+def test_analyze_bad_price_value(monitor, bad_price):
+    """Test that a bad price value is reported per signal, not raised."""
+    borrow_rates = [5.0, 7.0, 9.0, 11.0, 13.0, 15.0]
+    prices = [100.0, 102.0, 104.0, 106.0, 108.0, bad_price]
+    
+    results = monitor.analyze(borrow_rates, prices)
+    
+    for name in ('price_spike', 'abnormal_volatility'):
+        assert results['signals'][name]['detected'] is False
+        assert 'error' in results['signals'][name]
+
+
 def test_monitor_with_custom_config():
     """Test monitor with custom configuration."""
     config = Config()
@@ -90,12 +100,11 @@ def test_monitor_with_custom_config():
     assert 'flow_state' in results
 
 
-def test_signal_details_structure():
+def test_signal_details_structure(monitor):
     """Test that signal details have expected structure."""
     borrow_rates = [5.0, 7.0, 9.0, 11.0, 13.0, 15.0, 17.0, 19.0]
     prices = [100.0, 102.0, 105.0, 108.0, 112.0, 117.0, 123.0, 130.0]
     
-    monitor = FlowStateMonitor()
     results = monitor.analyze(borrow_rates, prices)
     
     # Check borrow level signal structure
@@ -115,13 +124,40 @@ def test_signal_details_structure():
     assert 'momentum_type' in momentum_signal
 
 
-def test_summary_contains_flow_state():
+def test_summary_contains_flow_state(monitor):
     """Test that summary mentions the flow state."""
     borrow_rates = [1.0, 1.2, 1.3, 1.4, 1.5, 1.6]
     prices = [100.0, 100.5, 101.0, 101.5, 102.0, 102.5]
     
-    monitor = FlowStateMonitor()
     results = monitor.analyze(borrow_rates, prices)
     
-    summary = results['summary'].upper()
-    assert results['flow_state'] in summary
+    match = _FLOW_STATE_RE.search(results['summary'])
+    assert match and match.group(1).upper() == results['flow_state']
+
+
+def test_step_matches_analyze():
+    """Test that step() gives the same results as analyze() on full history."""
+    # Longer than the step() buffer so that old observations get evicted
+    borrow_rates = [2.0 + (i % 7) * 1.5 + i * 0.3 for i in range(40)]
+    prices = [100.0 + i + (8.0 if i % 9 == 0 else 0.0) for i in range(40)]
+
+    stepped = FlowStateMonitor()
+    replayed = FlowStateMonitor()
+
+    for i, (rate, price) in enumerate(zip(borrow_rates, prices)):
+        result = stepped.step(rate, price)
+        if i + 1 < 6:
+            assert result is None
+            continue
+        expected = replayed.analyze(borrow_rates[:i + 1], prices[:i + 1])
+        assert result == expected
+
+
+def test_step_reset(monitor):
+    """Test that reset() clears step() history."""
+    for rate, price in zip([5.0, 7.0, 9.0, 11.0, 13.0, 15.0], [100.0, 101.0, 102.0, 103.0, 104.0, 105.0]):
+        monitor.step(rate, price)
+
+    monitor.reset()
+
+    assert monitor.step(15.0, 105.0) is None
@@ -1,34 +1,113 @@
 """Tests for price behavior detection module."""
 
+import numpy as np
 import pytest
+from flow_state_monitor._kernels import (
+    daily_returns_loop,
+    daily_returns_vectorized,
+    price_signals_loop,
+    price_signals_vectorized,
+    rolling_std_loop,
+    rolling_std_vectorized,
+    std_loop,
+    std_vectorized,
+)
 from flow_state_monitor.price_behavior import (
     calculate_daily_returns,
+    calculate_log_returns,
     calculate_volatility,
     detect_price_spike,
-    detect_abnormal_volatility
+    detect_price_spike_batch,
+    detect_abnormal_volatility,
+    detect_price_behavior_series,
+    RollingStd,
+    _as_f64,
 )
 
+pytestmark = pytest.mark.numeric
+
+
+def _frozen(values) -> np.ndarray:
+    """Read-only float64 array, so module-scoped data cannot be mutated."""
+    a = np.array(values, dtype=np.float64)
+    a.flags.writeable = False
+    return a
+
+
+@pytest.fixture(scope="module")
+def four_day_prices():
+    """Short price series with a gain, a loss and a gain."""
+    return _frozen([100.0, 105.0, 103.0, 108.0])
+
+
+@pytest.fixture(scope="module")
+def mixed_returns():
+    """Daily returns (percent) alternating in sign."""
+    return _frozen([1.0, -1.0, 2.0, -2.0, 1.5])
+
+
+@pytest.fixture(scope="module")
+def stable_then_spike():
+    """Flat prices followed by a large move on the last day."""
+    return _frozen([100.0] * 20 + [100.5, 110.0])
+
 
-def test_calculate_daily_returns():
+@pytest.fixture(scope="module")
+def normal_variation_prices():
+    """Prices with normal day-to-day variation (around 1% changes)."""
+    return _frozen([100.0, 101.0, 100.5, 101.5, 100.8, 102.0, 101.2, 102.5,
+                    101.8, 103.0, 102.2, 103.5, 102.8, 104.0, 103.2, 104.5,
+                    103.8, 105.0, 104.2, 105.5, 104.8, 106.0, 105.2])
+
+
+def test_calculate_daily_returns(four_day_prices):
     """Test daily returns calculation."""
-    prices = [100.0, 105.0, 103.0, 108.0]
-    returns = calculate_daily_returns(prices)
+    returns = calculate_daily_returns(four_day_prices)
     
+    assert isinstance(returns, np.ndarray)
     assert len(returns) == 3
     assert returns[0] == pytest.approx(5.0)  # (105-100)/100 * 100
     assert returns[1] == pytest.approx(-1.905, abs=0.01)  # (103-105)/105 * 100
     assert returns[2] == pytest.approx(4.854, abs=0.01)  # (108-103)/103 * 100
 
 
-def test_calculate_volatility():
+def test_calculate_log_returns(four_day_prices):
+    """Test log returns calculation and additivity over the period."""
+    returns = calculate_log_returns(four_day_prices)
+    
+    assert isinstance(returns, np.ndarray)
+    assert len(returns) == 3
+    assert returns[0] == pytest.approx(4.879, abs=0.01)  # ln(105/100) * 100
+    assert sum(returns) == pytest.approx(np.log(108.0 / 100.0) * 100.0)
+    
+    with pytest.raises(ValueError, match="must be positive"):
+        calculate_log_returns([100.0, 0.0])
+
+
+def test_as_f64_is_zero_copy_for_float64_arrays():
+    """Test float64 arrays pass through unchanged and lists are converted."""
+    prices = np.array([100.0, 105.0, 103.0])
+    
+    assert _as_f64(prices) is prices
+    converted = _as_f64([100, 105, 103])
+    assert converted.dtype == np.float64 and converted.flags.c_contiguous
+
+
+def test_calculate_volatility(mixed_returns):
     """Test volatility calculation."""
-    returns = [1.0, -1.0, 2.0, -2.0, 1.5]
-    volatility = calculate_volatility(returns)
+    volatility = calculate_volatility(mixed_returns)
     
     assert volatility > 0
     assert isinstance(volatility, float)
 
 
+def test_calculate_volatility_annualized(mixed_returns):
+    """Test annualized volatility scales daily volatility by sqrt(252)."""
+    assert calculate_volatility(mixed_returns, annualize=True) == pytest.approx(
+        calculate_volatility(mixed_returns) * 252 ** 0.5
+    )
+
+
 def test_detect_price_spike_positive():
     """Test detection of positive price spike."""
     prices = [100.0, 102.0, 103.0, 104.0, 110.0]  # 5.77% spike at end
@@ -54,26 +133,79 @@ def test_detect_price_spike_at_threshold():
     assert detected is True
 
 
-def test_detect_abnormal_volatility_high():
+def test_detect_price_spike_batch_matches_single():
+    """Test batch spike detection agrees with detect_price_spike per row."""
+    prices = [
+        [100.0, 102.0, 103.0, 104.0, 110.0],
+        [100.0, 101.0, 102.0, 103.0, 104.0],
+        [101.0, 102.0, 103.0, 100.0, 105.0],
+    ]
+    detected, recent = detect_price_spike_batch(prices, spike_threshold=5.0)
+    
+    for i, row in enumerate(prices):
+        spike, details = detect_price_spike(row, spike_threshold=5.0)
+        assert detected[i] == spike
+        assert recent[i] == details["recent_return"]
+
+
+def test_detect_price_spike_batch_float32():
+    """Test the float32 batch path agrees with float64 away from the threshold."""
+    prices = np.array([
+        [100.0, 102.0, 110.0],
+        [100.0, 101.0, 102.0],
+        [100.0, 103.0, 95.0],
+    ], dtype=np.float32)
+    detected, recent = detect_price_spike_batch(prices, dtype=np.float32)
+    expected_detected, expected_recent = detect_price_spike_batch(prices)
+    
+    assert recent.dtype == np.float32
+    assert expected_recent.dtype == np.float64
+    np.testing.assert_array_equal(detected, expected_detected)
+    np.testing.assert_allclose(recent, expected_recent, rtol=1e-6)
+
+
+def test_detect_price_spike_batch_invalid_input():
+    """Test batch spike detection input validation."""
+    with pytest.raises(ValueError, match="2-D"):
+        detect_price_spike_batch([100.0, 105.0])
+    with pytest.raises(ValueError, match="at least 2"):
+        detect_price_spike_batch([[100.0], [105.0]])
+    with pytest.raises(ValueError, match="must be positive"):
+        detect_price_spike_batch([[100.0, 105.0], [0.0, 105.0]])
+
+
+def test_detect_abnormal_volatility_high(stable_then_spike):
     """Test detection of abnormally high volatility."""
-    # Stable prices followed by large move
-    prices = [100.0] * 20 + [100.5, 110.0]  # Large spike at end
-    detected, details = detect_abnormal_volatility(prices, lookback_period=20)
+    detected, details = detect_abnormal_volatility(stable_then_spike, lookback_period=20)
     
     assert detected is True
 
 
-def test_detect_abnormal_volatility_normal():
+def test_detect_abnormal_volatility_normal(normal_variation_prices):
     """Test that normal volatility is not flagged."""
-    # Prices with normal day-to-day variation (around 1% changes)
-    prices = [100.0, 101.0, 100.5, 101.5, 100.8, 102.0, 101.2, 102.5, 
-              101.8, 103.0, 102.2, 103.5, 102.8, 104.0, 103.2, 104.5,
-              103.8, 105.0, 104.2, 105.5, 104.8, 106.0, 105.2]
-    detected, details = detect_abnormal_volatility(prices, lookback_period=20)
+    detected, details = detect_abnormal_volatility(normal_variation_prices, lookback_period=20)
     
     assert detected is False
 
 
+def test_detect_abnormal_volatility_streaming_matches_full():
+    """Test a RollingStd baseline gives the same decisions as recomputing."""
+    rng = np.random.default_rng(1)
+    prices = 100.0 * np.cumprod(1.0 + rng.normal(0.0, 0.02, 200))
+    rolling = RollingStd(window=20)
+    
+    for i in range(1, len(prices)):
+        window = prices[:i + 1]
+        if rolling.is_full:
+            expected, expected_details = detect_abnormal_volatility(window, lookback_period=20)
+            detected, details = detect_abnormal_volatility(
+                window, lookback_period=20, historical_volatility=rolling.std()
+            )
+            assert detected == expected
+            assert details == pytest.approx(expected_details)
+        rolling.push(detect_price_spike(window)[1]["recent_return"])
+
+
 def test_calculate_returns_insufficient_data():
     """Test that insufficient data raises ValueError."""
     with pytest.raises(ValueError, match="at least 2"):
@@ -86,6 +218,14 @@ def test_calculate_returns_negative_price():
         calculate_daily_returns([100.0, -50.0])
 
 
+def test_calculate_returns_negative_price_after_nan():
+    """Test that a NaN does not hide a non-positive price."""
+    with pytest.raises(ValueError, match="must be positive"):
+        calculate_daily_returns([np.nan, 100.0, -50.0])
+    with pytest.raises(ValueError, match="must be positive"):
+        detect_price_spike_batch([[np.nan, -50.0], [100.0, 101.0]])
+
+
 def test_calculate_volatility_empty():
     """Test that empty returns list raises ValueError."""
     with pytest.raises(ValueError, match="cannot be empty"):
@@ -98,7 +238,143 @@ def test_detect_spike_insufficient_data():
         detect_price_spike([100.0])
 
 
+def test_detect_spike_non_positive_price():
+    """Test that a non-positive price in the last two raises ValueError."""
+    with pytest.raises(ValueError, match="must be positive"):
+        detect_price_spike([100.0, 101.0, 0.0])
+    
+    with pytest.raises(ValueError, match="must be positive"):
+        detect_price_spike(np.array([100.0, -1.0, 101.0]))
+
+
 def test_detect_volatility_insufficient_data():
     """Test that insufficient data raises ValueError."""
     with pytest.raises(ValueError, match="at least"):
         detect_abnormal_volatility([100.0, 101.0], lookback_period=20)
+
+
+def test_rolling_std_matches_volatility():
+    """Test rolling std matches a full recomputation over each window."""
+    returns = [1.0, -0.5, 2.0, -2.0, 1.5, 0.3, -1.2, 0.8, 4.0, -3.1]
+    rolling = RollingStd(window=4)
+    
+    for i, r in enumerate(returns):
+        rolling.push(r)
+        window = returns[max(0, i - 3):i + 1]
+        assert rolling.std() == pytest.approx(calculate_volatility(window))
+    
+    assert len(rolling) == 4
+    assert rolling.is_full
+
+
+def test_rolling_std_long_stream():
+    """Test rolling std stays accurate past several rebase intervals."""
+    rng = np.random.default_rng(0)
+    returns = (1000.0 + rng.normal(0.0, 2.0, 10000)).tolist()
+    rolling = RollingStd(window=20)
+    
+    for r in returns:
+        rolling.push(r)
+    
+    assert rolling.std() == pytest.approx(calculate_volatility(returns[-20:]), rel=1e-9)
+
+
+def test_rolling_std_flat_window_after_large_move():
+    """Test a flat window after a large move has (near) zero volatility."""
+    returns = [1000.0, -1000.0, 0.1, 0.1, 0.1]
+    rolling = RollingStd(window=3)
+    
+    for r in returns:
+        rolling.push(r)
+    
+    assert rolling.std() == pytest.approx(0.0, abs=1e-12)
+    assert rolling_std_loop(np.array(returns), 3)[-1] == pytest.approx(0.0, abs=1e-12)
+
+
+def test_rolling_std_empty():
+    """Test that std of an empty window raises ValueError."""
+    with pytest.raises(ValueError, match="cannot be empty"):
+        RollingStd(window=5).std()
+
+
+def test_price_behavior_series_matches_daily_detectors():
+    """Test series detection agrees with running the detectors day by day."""
+    prices = [100.0, 101.0, 100.5, 101.5, 100.8, 102.0, 101.2, 102.5,
+              101.8, 103.0, 102.2, 112.0, 111.0, 104.0, 104.5, 110.5]
+    series = detect_price_behavior_series(prices, spike_threshold=5.0, lookback_period=5)
+    
+    assert len(series["spike"]) == len(prices)
+    assert not series["spike"][0]
+    for i in range(1, len(prices)):
+        spike, spike_details = detect_price_spike(prices[:i + 1], spike_threshold=5.0)
+        assert series["spike"][i] == spike
+        assert series["recent_return"][i] == pytest.approx(spike_details["recent_return"])
+        if i + 1 < 7:
+            assert not series["abnormal_volatility"][i]
+            assert np.isnan(series["historical_volatility"][i])
+        else:
+            abnormal, vol_details = detect_abnormal_volatility(prices[:i + 1], lookback_period=5)
+            assert series["abnormal_volatility"][i] == abnormal
+            assert series["historical_volatility"][i] == pytest.approx(
+                vol_details["historical_volatility"]
+            )
+
+
+def test_price_behavior_series_exact_at_threshold_ties():
+    """Test series volatility is bitwise equal to the detector, ties included."""
+    rng = np.random.default_rng(3)
+    prices = 100.0 * np.cumprod(1.0 + rng.normal(0.0, 0.02, 300))
+    series = detect_price_behavior_series(prices, lookback_period=20)
+    
+    for i in range(21, len(prices)):
+        _, details = detect_abnormal_volatility(prices[:i + 1], lookback_period=20)
+        assert series["historical_volatility"][i] == details["historical_volatility"]
+        
+        if i % 10 == 0:
+            # Multiplier that puts this day's return right at the threshold
+            tie = details["recent_return"] / details["historical_volatility"]
+            abnormal, _ = detect_abnormal_volatility(
+                prices[:i + 1], lookback_period=20, threshold_multiplier=tie
+            )
+            tied = detect_price_behavior_series(
+                prices[:i + 1], lookback_period=20, threshold_multiplier=tie
+            )
+            assert tied["abnormal_volatility"][i] == abnormal
+
+
+def test_price_signal_kernels_agree():
+    """Test the loop kernel and the NumPy fallback produce the same output."""
+    returns = np.array([0.5, -1.0, 0.8, 6.0, -0.3, 0.2, -7.5, 1.1, 0.4, 9.0])
+    loop = price_signals_loop(returns, 5.0, 4, 2.0)
+    vectorized = price_signals_vectorized(returns, 5.0, 4, 2.0)
+    
+    np.testing.assert_array_equal(loop[0], vectorized[0])
+    np.testing.assert_array_equal(loop[1], vectorized[1])
+    np.testing.assert_allclose(loop[2], vectorized[2])
+
+
+def test_numeric_kernels_agree():
+    """Test the returns/std loop kernels match their NumPy fallbacks."""
+    prices = np.array([100.0, 101.0, 100.5, 101.5, 107.0, 104.0, 104.5, 99.0, 100.2])
+    returns = daily_returns_vectorized(prices)
+    
+    np.testing.assert_array_equal(daily_returns_loop(prices), returns)
+    assert std_loop(returns) == pytest.approx(std_vectorized(returns))
+    np.testing.assert_allclose(rolling_std_loop(returns, 3), rolling_std_vectorized(returns, 3))
+    assert len(rolling_std_loop(returns, 9)) == len(rolling_std_vectorized(returns, 9)) == 0
+    
+    # Long enough to cross several rebase intervals of the running update
+    long_values = 1000.0 + np.random.default_rng(0).normal(0.0, 2.0, 10000)
+    np.testing.assert_allclose(
+        rolling_std_loop(long_values, 20), rolling_std_vectorized(long_values, 20), rtol=1e-9
+    )
+
+
+def test_rolling_std_bottleneck_agrees():
+    """Test the Bottleneck rolling std matches the loop kernel."""
+    pytest.importorskip("bottleneck")
+    from flow_state_monitor._kernels import rolling_std_bottleneck
+    
+    values = np.random.default_rng(0).normal(0.0, 2.0, 500)
+    np.testing.assert_allclose(rolling_std_bottleneck(values, 20), rolling_std_loop(values, 20), rtol=1e-9)
+    assert len(rolling_std_bottleneck(values[:5], 20)) == 0
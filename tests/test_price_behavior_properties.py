@@ -0,0 +1,101 @@
+"""Property-based tests for price behavior kernels (requires hypothesis)."""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("hypothesis")
+
+from hypothesis import given, settings, strategies as st
+
+from flow_state_monitor._kernels import (
+    BOTTLENECK_AVAILABLE,
+    rolling_std_bottleneck,
+    rolling_std_loop,
+    rolling_std_vectorized,
+)
+from flow_state_monitor.price_behavior import (
+    RollingStd,
+    calculate_daily_returns,
+    calculate_volatility,
+)
+
+pytestmark = pytest.mark.numeric
+
+# Running-update rolling std kernels, each checked against recomputation
+running_kernels = pytest.mark.parametrize("kernel", [
+    rolling_std_loop,
+    pytest.param(
+        rolling_std_bottleneck,
+        marks=pytest.mark.skipif(not BOTTLENECK_AVAILABLE, reason="bottleneck not installed"),
+    ),
+], ids=["loop", "bottleneck"])
+
+# Ragged lengths up to 4096 exercise vector tails and every alignment
+prices_lists = st.lists(
+    st.floats(min_value=0.01, max_value=1e6, allow_nan=False, allow_infinity=False),
+    min_size=2,
+    max_size=4096,
+)
+returns_lists = st.lists(
+    st.floats(min_value=-50.0, max_value=50.0, allow_nan=False, allow_infinity=False),
+    min_size=1,
+    max_size=4096,
+)
+
+
+@settings(deadline=None)
+@given(prices_lists)
+def test_daily_returns_match_reference(prices):
+    """Test daily returns against a straightforward NumPy reference."""
+    p = np.array(prices)
+    expected = (p[1:] / p[:-1] - 1.0) * 100.0
+
+    np.testing.assert_allclose(calculate_daily_returns(prices), expected, rtol=1e-9, atol=1e-9)
+
+
+@running_kernels
+@settings(deadline=None)
+@given(returns_lists, st.integers(min_value=1, max_value=64))
+def test_rolling_std_kernels_agree(kernel, returns, window):
+    """Test the running-update rolling std against per-window recomputation."""
+    values = np.array(returns)
+
+    np.testing.assert_allclose(
+        kernel(values, window), rolling_std_vectorized(values, window),
+        rtol=1e-7, atol=1e-9
+    )
+
+
+@running_kernels
+@settings(deadline=None)
+@given(
+    returns_lists,
+    st.integers(min_value=1, max_value=64),
+    st.floats(min_value=-50.0, max_value=50.0, allow_nan=False, allow_infinity=False),
+)
+def test_rolling_std_flat_after_spike(kernel, returns, window, level):
+    """Test a flat window after arbitrary moves has (near) zero volatility."""
+    values = np.array(returns + [level] * window)
+
+    assert kernel(values, window)[-1] == pytest.approx(0.0, abs=1e-9)
+
+
+@running_kernels
+def test_rolling_std_flat_after_large_moves(kernel):
+    """Test the flat-after-spike case that leaves a residue in move_std."""
+    values = np.r_[np.random.default_rng(8).normal(0.0, 30.0, 5000), [0.2] * 20]
+
+    assert kernel(values, 20)[-1] == pytest.approx(0.0, abs=1e-12)
+
+
+@settings(deadline=None)
+@given(returns_lists, st.integers(min_value=1, max_value=64))
+def test_rolling_std_class_matches_volatility(returns, window):
+    """Test RollingStd after streaming all values matches a full recompute."""
+    rolling = RollingStd(window=window)
+    for r in returns:
+        rolling.push(r)
+
+    assert rolling.std() == pytest.approx(
+        calculate_volatility(returns[-window:]), rel=1e-7, abs=1e-9
+    )
@@ -0,0 +1,76 @@
+"""Tests for signal generation module."""
+
+from flow_state_monitor.signals import SignalGenerator
+
+
+def test_insufficient_history():
+    """Test that the first update always holds."""
+    generator = SignalGenerator()
+    signal, reason = generator.update("ON", "ON", 0.5, 12.0, 100.0)
+
+    assert signal == "HOLD"
+    assert "Insufficient history" in reason
+
+
+def test_buy_when_both_states_flip_same_day():
+    """Test BUY when market_state and flow_state flip OFF → ON together."""
+    generator = SignalGenerator()
+    generator.update("OFF", "OFF", 0.0, 3.0, 100.0)
+    signal, reason = generator.update("ON", "ON", 1.5, 9.0, 107.0)
+
+    assert signal == "BUY"
+    assert "Both market_state and flow_state" in reason
+
+
+def test_buy_when_states_flip_within_one_day():
+    """Test BUY when the second state flips one day after the first."""
+    generator = SignalGenerator()
+    generator.update("OFF", "OFF", 0.0, 3.0, 100.0)
+    assert generator.update("ON", "OFF", 0.8, 6.0, 101.0)[0] == "HOLD"
+    signal, reason = generator.update("ON", "ON", 1.2, 8.0, 104.0)
+
+    assert signal == "BUY"
+    assert "within 1 day" in reason
+
+
+def test_no_buy_when_flips_two_days_apart():
+    """Test that flips more than one day apart do not trigger BUY."""
+    generator = SignalGenerator()
+    generator.update("OFF", "OFF", 0.0, 3.0, 100.0)
+    generator.update("ON", "OFF", 0.8, 6.0, 101.0)
+    generator.update("ON", "OFF", 0.8, 6.5, 101.0)
+    signal, _ = generator.update("ON", "ON", 1.2, 8.0, 104.0)
+
+    assert signal == "HOLD"
+
+
+def test_sell_after_confirmation_day():
+    """Test SELL only once momentum stays below -epsilon for two updates."""
+    generator = SignalGenerator(epsilon=0.05)
+    generator.update("ON", "ON", 0.5, 18.0, 128.0)
+    signal, reason = generator.update("ON", "WEAKENING", -0.2, 17.8, 127.0)
+    assert signal == "HOLD"
+    assert "awaiting 1-day confirmation" in reason
+
+    signal, reason = generator.update("ON", "WEAKENING", -0.4, 17.0, 125.0)
+    assert signal == "SELL"
+    assert reason.startswith("EXIT")
+
+
+def test_reset_clears_tracked_state():
+    """Test that reset forgets prior transitions and exit streaks."""
+    generator = SignalGenerator()
+    generator.update("OFF", "OFF", -0.2, 3.0, 100.0)
+    generator.reset()
+
+    signal, reason = generator.update("ON", "ON", -0.2, 9.0, 107.0)
+    assert signal == "HOLD"
+    assert "Insufficient history" in reason
+    assert generator.exit_streak == 1
+
+
+def test_generator_has_no_instance_dict():
+    """Test that SignalGenerator state is held in slots."""
+    generator = SignalGenerator()
+
+    assert not hasattr(generator, "__dict__")